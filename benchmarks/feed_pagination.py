@@ -0,0 +1,176 @@
+"""Offset vs keyset pagination of the questionnaire feed.
+
+Seeds a synthetic unlogged copy of the feed columns with millions of rows and a
+like history for one viewer, then times one page at growing depth with both
+strategies, using the same predicates as the real feed query:
+
+    python -m benchmarks.feed_pagination --rows 3000000 --likes 20000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    Uuid,
+    func,
+    select,
+    text,
+    true,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.sql import Select
+
+from src.config import settings
+
+PAGE_SIZE = 5
+CITY = "city_0"
+VIEWER_ID = uuid.UUID("00000000-0000-4000-8000-000000000001")
+
+metadata = MetaData()
+bench_feed = Table(
+    "bench_feed",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("user_id", Uuid, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("city", String, nullable=False),
+    Column("gender", String, nullable=False),
+    Column("is_visible", Boolean, nullable=False),
+    Index("ix_bench_feed_city_created_at_id", "city", "created_at", "id"),
+    prefixes=["UNLOGGED"],
+)
+bench_like = Table(
+    "bench_like",
+    metadata,
+    Column("user_id", Uuid, nullable=False),
+    Column("liked_user_id", Uuid, nullable=False),
+    UniqueConstraint("user_id", "liked_user_id"),
+    prefixes=["UNLOGGED"],
+)
+
+
+async def seed(conn: AsyncConnection, rows: int, likes: int) -> None:
+    await conn.run_sync(metadata.drop_all)
+    await conn.run_sync(metadata.create_all)
+    await conn.execute(text(
+        "INSERT INTO bench_feed (id, user_id, created_at, city, gender, is_visible) "
+        "SELECT gen_random_uuid(), gen_random_uuid(), now() - make_interval(secs => n), "
+        "'city_' || (n % 4), CASE WHEN n % 3 = 0 THEN 'Male' ELSE 'Female' END, true "
+        "FROM generate_series(1, :rows) AS n",
+    ), {"rows": rows})
+    await conn.execute(text(
+        "INSERT INTO bench_like (user_id, liked_user_id) "
+        "SELECT :viewer, user_id FROM bench_feed WHERE city = :city "
+        "ORDER BY random() LIMIT :likes",
+    ), {"viewer": VIEWER_ID, "city": CITY, "likes": likes})
+    await conn.execute(text("ANALYZE bench_feed"))
+    await conn.execute(text("ANALYZE bench_like"))
+
+
+def base_query() -> Select:
+    liked_user_ids = select(bench_like.c.liked_user_id).where(bench_like.c.user_id == VIEWER_ID)
+    return select(bench_feed).where(
+        bench_feed.c.user_id != VIEWER_ID,
+        bench_feed.c.city == CITY,
+        bench_feed.c.gender != "Male",
+        bench_feed.c.is_visible.is_(true()),
+        bench_feed.c.user_id.notin_(liked_user_ids),
+    )
+
+
+def offset_query(depth: int) -> Select:
+    return (
+        base_query()
+        .order_by(bench_feed.c.created_at, bench_feed.c.id)
+        .limit(PAGE_SIZE).offset(depth)
+    )
+
+
+def keyset_query(after: tuple | None) -> Select:
+    query = base_query().order_by(bench_feed.c.created_at, bench_feed.c.id).limit(PAGE_SIZE)
+    if after is not None:
+        after = tuple_(*after, types=[DateTime, Uuid])
+        query = query.where(tuple_(bench_feed.c.created_at, bench_feed.c.id) > after)
+    return query
+
+
+async def timed(conn: AsyncConnection, query: Select) -> tuple[float, list]:
+    start = time.perf_counter()
+    rows = (await conn.execute(query)).fetchall()
+    return (time.perf_counter() - start) * 1000, rows
+
+
+async def explain(conn: AsyncConnection, query: Select) -> str:
+    compiled = query.compile(conn.engine, compile_kwargs={"literal_binds": True})
+    plan = await conn.execute(text(f"EXPLAIN (ANALYZE, COSTS OFF) {compiled}"))
+    return "\n".join(row[0] for row in plan)
+
+
+async def run(rows: int, likes: int, depths: list[int]) -> None:
+    engine = create_async_engine(settings.db_url_postgresql)
+    async with engine.begin() as conn:
+        await seed(conn, rows, likes)
+
+    async with engine.connect() as conn:
+        seeded = await conn.scalar(select(func.count()).select_from(bench_feed))
+        pool = await conn.scalar(select(func.count()).select_from(base_query().subquery()))
+        liked = await conn.scalar(select(func.count()).select_from(bench_like))
+        if seeded != rows:
+            raise RuntimeError(f"expected {rows} seeded questionnaires, got {seeded}")
+        print(f"seeded {seeded} questionnaires, {pool} eligible for the viewer, {liked} likes")
+
+        print(f"{'depth':>10} {'offset, ms':>12} {'keyset, ms':>12}")
+        deepest = None
+        for depth in depths:
+            offset_ms, page = await timed(conn, offset_query(depth))
+            if not page:
+                print(f"{depth:>10} is past the end of the feed, stopping")
+                break
+
+            after = None
+            if depth > 0:
+                # the last row of the page right before `depth`
+                last = (await conn.execute(offset_query(depth - 1).limit(1))).one()
+                after = (last.created_at, last.id)
+            keyset_ms, keyset_page = await timed(conn, keyset_query(after))
+            if [row.id for row in keyset_page] != [row.id for row in page]:
+                raise RuntimeError(f"keyset and offset pages differ at depth {depth}")
+
+            print(f"{depth:>10} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+            deepest = after
+
+        if deepest is not None:
+            print("\nkeyset plan at the deepest depth:")
+            print(await explain(conn, keyset_query(deepest)))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--likes", type=int, default=20_000)
+    parser.add_argument(
+        "--depths",
+        type=int,
+        nargs="+",
+        default=[0, 1_000, 10_000, 100_000, 300_000, 450_000],
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.likes, args.depths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Vectorized vs pure-Python compatibility ranking of feed candidates.
+
+Builds a synthetic batch of candidates, then times scoring it with the NumPy
+ranking engine (the encoding step separately) and with a plain Python loop
+computing the same scores:
+
+    python -m benchmarks.feed_ranking --candidates 3000
+"""
+import argparse
+import random
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.questionnaire import ranking
+from src.questionnaire.hobbies import hobby_mask
+
+HOBBIES = 200
+REPEAT = 50
+
+
+def candidates(count: int, rng: random.Random) -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            **{field: rng.choice([*choice, None]) for field, choice in ranking.CHOICES.items()},
+            height=rng.choice([rng.randint(150, 200), None]),
+            birthday=date(1980, 1, 1) + timedelta(days=rng.randint(0, 365 * 25)),
+            hobby_ids=rng.sample(range(1, HOBBIES + 1), rng.randint(0, 6)),
+        )
+        for _ in range(count)
+    ]
+
+
+def python_score(viewer: SimpleNamespace, questionnaires: list[SimpleNamespace], weights: list[float]) -> list[float]:
+    """The same scores as ranking.score, one candidate at a time."""
+    def clip(value: float) -> float:
+        return min(max(value, 0.0), 1.0)
+
+    viewer_hobbies = set(viewer.hobby_ids)
+    viewer_choices = {field: ranking._choice_index(field, getattr(viewer, field)) for field in ranking.CHOICES}
+    scores = []
+    for questionnaire in questionnaires:
+        similarities = []
+        for field, choice in ranking.CHOICES.items():
+            mine, theirs = viewer_choices[field], ranking._choice_index(field, getattr(questionnaire, field))
+            if ranking.MISSING in (mine, theirs):
+                similarities.append(0.0)
+            elif field == "goals":
+                similarities.append(float(mine == theirs))
+            else:
+                similarities.append(1 - abs(mine - theirs) / (len(choice) - 1))
+        if viewer.height is None or questionnaire.height is None:
+            similarities.append(0.0)
+        else:
+            similarities.append(clip(1 - abs(questionnaire.height - viewer.height) / ranking.HEIGHT_SCALE_CM))
+        days = abs((questionnaire.birthday - viewer.birthday).days)
+        similarities.append(clip(1 - days / ranking.AGE_SCALE_DAYS))
+        hobbies = set(questionnaire.hobby_ids)
+        union = len(hobbies | viewer_hobbies)
+        similarities.append(len(hobbies & viewer_hobbies) / union if union else 0.0)
+        scores.append(sum(similarity * weight for similarity, weight in zip(similarities, weights, strict=True)))
+    return scores
+
+
+def timed(func: Callable[[], object]) -> float:
+    """Best of REPEAT runs, in ms."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def run(count: int) -> None:
+    rng = random.Random(0)
+    (viewer,) = candidates(1, rng)
+    questionnaires = candidates(count, rng)
+    weights = ranking.ranking_weights({})
+
+    viewer_hobbies = hobby_mask(viewer.hobby_ids)
+    viewer_features = ranking.encode([viewer], viewer_hobbies)
+    features = ranking.encode(questionnaires, viewer_hobbies)
+    vectorized = ranking.score(viewer_features, features, weights)
+    expected = python_score(viewer, questionnaires, weights.tolist())
+    if not np.allclose(vectorized, expected):
+        raise RuntimeError("the vectorized and the pure-Python scores differ")
+
+    print(f"{count} candidates")
+    print(f"{'scorer':>22} {'ms':>10}")
+    print(f"{'numpy score':>22} {timed(lambda: ranking.score(viewer_features, features, weights)):>10.3f}")
+    print(f"{'numpy encode':>22} {timed(lambda: ranking.encode(questionnaires, viewer_hobbies)):>10.3f}")
+    python_ms = timed(lambda: python_score(viewer, questionnaires, weights.tolist()))
+    print(f"{'pure python':>22} {python_ms:>10.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candidates", type=int, default=3000)
+    args = parser.parse_args()
+    run(args.candidates)
+
+
+if __name__ == "__main__":
+    main()
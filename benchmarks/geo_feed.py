@@ -0,0 +1,195 @@
+"""City equality vs distance-based feed selection.
+
+Seeds a synthetic unlogged copy of the feed columns with profiles scattered around
+a set of city centres, then times one feed page for a viewer in the first city
+with the old `city ==` filter, with the geohash + bounding box + haversine filter
+and with the haversine check alone:
+
+    python -m benchmarks.geo_feed --rows 3000000 --radius 30
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    Uuid,
+    func,
+    select,
+    text,
+    true,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.sql import Select
+
+from src.config import settings
+from src.questionnaire import geo
+
+PAGE_SIZE = 5
+CITIES = 100
+# profiles of a city are spread this far around its centre
+CITY_SPREAD_KM = 25
+REPEAT = 5
+
+metadata = MetaData()
+bench_geo_feed = Table(
+    "bench_geo_feed",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("user_id", Uuid, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("city", String, nullable=False),
+    Column("gender", String, nullable=False),
+    Column("is_visible", Boolean, nullable=False),
+    Column("latitude", Numeric(8, 5), nullable=False),
+    Column("longitude", Numeric(8, 5), nullable=False),
+    Column("geohash", String(length=12, collation="C"), nullable=False),
+    Index("ix_bench_geo_feed_city_created_at_id", "city", "created_at", "id"),
+    Index("ix_bench_geo_feed_geohash", "geohash"),
+    prefixes=["UNLOGGED"],
+)
+
+
+def city_centres(rng: random.Random) -> list[tuple[float, float]]:
+    return [(rng.uniform(43, 60), rng.uniform(25, 60)) for _ in range(CITIES)]
+
+
+def profiles(rows: int, centres: list[tuple[float, float]], rng: random.Random):
+    now = datetime.utcnow()
+    spread = CITY_SPREAD_KM / geo.KM_PER_DEGREE
+    for n in range(rows):
+        city = n % CITIES
+        latitude = round(centres[city][0] + rng.gauss(0, spread), 5)
+        longitude = round(centres[city][1] + rng.gauss(0, spread), 5)
+        yield (
+            uuid.uuid4(),
+            uuid.uuid4(),
+            now - timedelta(seconds=n),
+            f"city_{city}",
+            "Male" if n % 3 == 0 else "Female",
+            True,
+            latitude,
+            longitude,
+            geo.encode_geohash(latitude, longitude),
+        )
+
+
+async def seed(conn: AsyncConnection, rows: int, centres: list[tuple[float, float]]) -> None:
+    await conn.run_sync(metadata.drop_all)
+    await conn.run_sync(metadata.create_all)
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        bench_geo_feed.name,
+        records=profiles(rows, centres, random.Random(0)),
+        columns=[column.name for column in bench_geo_feed.columns],
+    )
+    await conn.execute(text("ANALYZE bench_geo_feed"))
+
+
+def base_query() -> Select:
+    return (
+        select(bench_geo_feed)
+        .where(
+            bench_geo_feed.c.gender != "Male",
+            bench_geo_feed.c.is_visible.is_(true()),
+        )
+        .order_by(bench_geo_feed.c.created_at, bench_geo_feed.c.id)
+        .limit(PAGE_SIZE)
+    )
+
+
+def city_query() -> Select:
+    return base_query().where(bench_geo_feed.c.city == "city_0")
+
+
+def geo_query(centre: tuple[float, float], radius: float) -> Select:
+    return base_query().where(*geo.within_range(
+        bench_geo_feed.c.latitude,
+        bench_geo_feed.c.longitude,
+        bench_geo_feed.c.geohash,
+        *centre,
+        0,
+        radius,
+    ))
+
+
+def haversine_query(centre: tuple[float, float], radius: float) -> Select:
+    distance = geo.haversine_km(bench_geo_feed.c.latitude, bench_geo_feed.c.longitude, *centre)
+    return base_query().where(distance <= radius)
+
+
+async def timed(conn: AsyncConnection, query: Select) -> float:
+    """Best of REPEAT runs, in ms."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        (await conn.execute(query)).fetchall()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+async def matching(conn: AsyncConnection, query: Select) -> int:
+    return await conn.scalar(select(func.count()).select_from(query.limit(None).order_by(None).subquery()))
+
+
+async def explain(conn: AsyncConnection, query: Select) -> str:
+    compiled = query.compile(conn.engine, compile_kwargs={"literal_binds": True})
+    plan = await conn.execute(text(f"EXPLAIN (ANALYZE, COSTS OFF) {compiled}"))
+    return "\n".join(row[0] for row in plan)
+
+
+async def run(rows: int, radius: float) -> None:
+    centres = city_centres(random.Random(0))
+    engine = create_async_engine(settings.db_url_postgresql)
+    async with engine.begin() as conn:
+        await seed(conn, rows, centres)
+
+    queries = {
+        "city ==": city_query(),
+        "geohash + box + haversine": geo_query(centres[0], radius),
+        "haversine only": haversine_query(centres[0], radius),
+    }
+    async with engine.connect() as conn:
+        seeded = await conn.scalar(select(func.count()).select_from(bench_geo_feed))
+        if seeded != rows:
+            raise RuntimeError(f"expected {rows} seeded questionnaires, got {seeded}")
+        print(f"seeded {seeded} questionnaires around {CITIES} cities, radius {radius} km")
+
+        print(f"{'query':>26} {'matching':>10} {'page, ms':>10}")
+        found = {}
+        for name, query in queries.items():
+            page_ms = await timed(conn, query)
+            found[name] = await matching(conn, query)
+            print(f"{name:>26} {found[name]:>10} {page_ms:>10.2f}")
+        # the prefilters may only drop rows the exact check would drop anyway
+        if found["geohash + box + haversine"] != found["haversine only"]:
+            raise RuntimeError("the geohash and bounding box prefilter lost matching profiles")
+
+        print("\ndistance plan:")
+        print(await explain(conn, queries["geohash + box + haversine"]))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.drop_all)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--radius", type=float, default=30)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.radius))
+
+
+if __name__ == "__main__":
+    main()
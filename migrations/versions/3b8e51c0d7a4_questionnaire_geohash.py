@@ -0,0 +1,62 @@
+"""questionnaire geohash
+
+Revision ID: 3b8e51c0d7a4
+Revises: 920f9cd64d9e
+Create Date: 2026-10-18 18:20:11.502317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.questionnaire.geo import encode_geohash
+
+# revision identifiers, used by Alembic.
+revision = '3b8e51c0d7a4'
+down_revision = '920f9cd64d9e'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 10_000
+
+
+def upgrade() -> None:
+    op.add_column(
+        'user_questionnaire',
+        sa.Column('geohash', sa.String(length=12, collation='C'), nullable=True),
+    )
+
+    conn = op.get_bind()
+    select_batch = sa.text(
+        "SELECT id, latitude, longitude FROM user_questionnaire "
+        "WHERE geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL "
+        "LIMIT :batch"
+    )
+    set_geohash = sa.text("UPDATE user_questionnaire SET geohash = :geohash WHERE id = :id")
+    while rows := conn.execute(select_batch, {'batch': BACKFILL_BATCH}).all():
+        conn.execute(
+            set_geohash,
+            [
+                {'id': row.id, 'geohash': encode_geohash(float(row.latitude), float(row.longitude))}
+                for row in rows
+            ],
+        )
+
+    # built concurrently so the feed keeps serving while the index is created
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_questionnaire_geohash',
+            'user_questionnaire',
+            ['geohash'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_questionnaire_geohash',
+            table_name='user_questionnaire',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('user_questionnaire', 'geohash')
@@ -0,0 +1,36 @@
+"""feed age index
+
+Revision ID: 7c2d9a4e1f60
+Revises: 3b8e51c0d7a4
+Create Date: 2026-10-18 18:55:40.127734
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2d9a4e1f60'
+down_revision = '3b8e51c0d7a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # built concurrently so the feed keeps serving while the index is created
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_questionnaire_city_gender_birthday',
+            'user_questionnaire',
+            ['city', 'gender', 'birthday'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_questionnaire_city_gender_birthday',
+            table_name='user_questionnaire',
+            postgresql_concurrently=True,
+        )
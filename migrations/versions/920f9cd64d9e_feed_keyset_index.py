@@ -0,0 +1,37 @@
+"""feed keyset index
+
+Revision ID: 920f9cd64d9e
+Revises: fa5f9699e17b
+Create Date: 2026-10-18 10:02:41.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '920f9cd64d9e'
+down_revision = 'fa5f9699e17b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # built concurrently so the feed keeps serving while the index is created
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_questionnaire_city_created_at_id',
+            'user_questionnaire',
+            ['city', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_questionnaire_city_created_at_id',
+            table_name='user_questionnaire',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,32 @@
+"""daily quota in redis
+
+Revision ID: b41f7e2a9c35
+Revises: 7c2d9a4e1f60
+Create Date: 2026-10-18 19:31:06.845210
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b41f7e2a9c35'
+down_revision = '7c2d9a4e1f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'user_settings',
+        sa.Column('timezone', sa.String(length=64), server_default='UTC', nullable=False),
+    )
+    op.drop_column('user_questionnaire', 'quest_lists_per_day')
+
+
+def downgrade() -> None:
+    op.add_column(
+        'user_questionnaire',
+        sa.Column('quest_lists_per_day', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.drop_column('user_settings', 'timezone')
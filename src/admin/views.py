@@ -1,5 +1,10 @@
+from typing import Any
+
+from starlette.requests import Request
 from starlette_admin.contrib.sqla import ModelView
 
+from src.questionnaire import blacklist
+
 
 class BaseView(ModelView):
     exclude_fields_from_edit = ("created_at",)
@@ -19,7 +24,27 @@ class UserLikeView(BaseView):
 
 
 class BlackListUserView(BaseView):
-    ...
+    """Blocks are cached per user, so every change drops the cache of both sides."""
+
+    async def create(self, request: Request, data: dict[str, Any]) -> Any:
+        obj = await super().create(request, data)
+        await blacklist.drop_blocked(obj.blocked_by_id, obj.blocked_id)
+        return obj
+
+    async def edit(self, request: Request, pk: Any, data: dict[str, Any]) -> Any:
+        old = await self.find_by_pk(request, pk)
+        user_ids = (old.blocked_by_id, old.blocked_id)
+        obj = await super().edit(request, pk, data)
+        await blacklist.drop_blocked(*user_ids, obj.blocked_by_id, obj.blocked_id)
+        return obj
+
+    async def delete(self, request: Request, pks: list[Any]) -> int | None:
+        objs = await self.find_by_pks(request, pks)
+        user_ids = [user_id for obj in objs for user_id in (obj.blocked_by_id, obj.blocked_id)]
+        deleted = await super().delete(request, pks)
+        if user_ids:
+            await blacklist.drop_blocked(*user_ids)
+        return deleted
 
 
 class UserSettingsView(BaseView):
@@ -83,7 +83,7 @@ async def update_user_profile(
     stmt = (
         update(UserSettings)
         .filter_by(user_id=user.id)
-        .values(data.dict())
+        .values(data.dict(exclude_unset=True))
         .returning(UserSettings)
     )
     profile = await session.execute(stmt)
@@ -10,6 +10,7 @@ AGE_MIN = 18
 AGE_MAX = 99
 RANGE_MIN = 0
 RANGE_MAX = 999
+DEFAULT_TIMEZONE = "UTC"
 
 
 class AuthUser(Base):
@@ -60,6 +61,11 @@ class UserSettings(Base):
         Integer,
         default=AGE_MAX,
     )
+    timezone: Mapped[str] = mapped_column(
+        String(length=64),
+        default=DEFAULT_TIMEZONE,
+        server_default=DEFAULT_TIMEZONE,
+    )
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("auth_user.id", ondelete="CASCADE"),
         nullable=True,
@@ -1,9 +1,10 @@
 import uuid
 from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from pydantic import BaseModel, EmailStr, Field, ValidationError, root_validator
+from pydantic import BaseModel, EmailStr, Field, ValidationError, root_validator, validator
 
-from src.auth.models import AGE_MAX, AGE_MIN, RANGE_MAX, RANGE_MIN
+from src.auth.models import AGE_MAX, AGE_MIN, DEFAULT_TIMEZONE, RANGE_MAX, RANGE_MIN
 
 
 class UserSchema(BaseModel):
@@ -29,10 +30,20 @@ class BaseUserProfile(BaseModel):
     search_range_max: int = Field(ge=RANGE_MIN, le=RANGE_MAX)
     search_age_min: int = Field(ge=AGE_MIN, le=AGE_MAX)
     search_age_max: int = Field(ge=AGE_MIN, le=AGE_MAX)
+    timezone: str = DEFAULT_TIMEZONE
 
     class Config:
         orm_mode = True
 
+    @validator("timezone")
+    @classmethod
+    def check_timezone(cls, value: str):
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError("Unknown timezone.") from None
+        return value
+
     @root_validator
     @classmethod
     def check_sum(cls, values: dict):
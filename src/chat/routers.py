@@ -7,7 +7,7 @@ from pydantic import ValidationError
 from starlette.websockets import WebSocketDisconnect
 
 from src.auth.models import AuthUser
-from src.chat.exceptions import NoMatchError
+from src.chat.exceptions import BlockedUserError, NoMatchError
 from src.chat.schemas import WSAction, WSMessageRequest, WSStatus
 from src.chat.utils import (
     create_message,
@@ -57,7 +57,7 @@ async def websocket_chat(
                 "status": WSStatus.ERROR,
                 "detail": "unknown action or bad message format",
             }))
-        except NoMatchError as e:
+        except (NoMatchError, BlockedUserError) as e:
             await ws.send_text(orjson_dumps({
                 "status": WSStatus.ERROR,
                 "detail": str(e),
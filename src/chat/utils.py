@@ -12,7 +12,7 @@ from starlette.websockets import WebSocket
 
 from src.auth.base_config import get_auth_user
 from src.auth.models import AuthUser
-from src.chat.exceptions import NoMatchError
+from src.chat.exceptions import BlockedUserError, NoMatchError
 from src.chat.redis import get_match
 from src.chat.schemas import (
     MessageCreateRequest,
@@ -26,6 +26,7 @@ from src.chat.schemas import (
     WSStatus,
 )
 from src.database import async_session_maker, get_async_session, mongo
+from src.questionnaire import blacklist
 
 
 def orjson_dumps(data: Any, **kwargs: Any):
@@ -98,9 +99,12 @@ async def create_message(ws_msg: WSMessageRequest, ws: WebSocket, user: AuthUser
     # TODO: get user's matches from redis and check if he can send message to 'to_id'
     async with async_session_maker() as session:
         match = await get_match(session, user, ws_msg)
+        blocked = await blacklist.is_blocked(user.id, ws_msg.message.to_id, session)
 
     if match is None:
         raise NoMatchError(user.id, ws_msg.message.to_id)
+    if blocked:
+        raise BlockedUserError(user.id, ws_msg.message.to_id)
 
     msg = await mongo.create_message(ws_msg.message)
 
@@ -1,3 +1,4 @@
+import math
 from pathlib import Path
 
 from pydantic import BaseSettings
@@ -42,6 +43,13 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRES_IN: int
     REFRESH_TOKEN_EXPIRES_IN: int
 
+    # bloom filter of the questionnaires a user has already liked or disliked
+    SEEN_FILTER_ERROR_RATE: float = 0.01
+    SEEN_FILTER_BYTES: int = 16 * 1024
+
+    # feed ranking weights overriding the defaults, json like {"goals": 3, "hobbies": 2}
+    FEED_RANKING_WEIGHTS: dict[str, float] = {}
+
     class Config:
         env_file = ".env"
 
@@ -82,5 +90,19 @@ class Settings(BaseSettings):
         """Product db url."""
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
 
+    @property
+    def seen_filter_bits(self) -> int:
+        return self.SEEN_FILTER_BYTES * 8
+
+    @property
+    def seen_filter_hashes(self) -> int:
+        """The optimal number of hash functions for the error rate."""
+        return max(1, math.ceil(-math.log2(self.SEEN_FILTER_ERROR_RATE)))
+
+    @property
+    def seen_filter_capacity(self) -> int:
+        """How many swipes fit in the filter before it gets worse than the error rate."""
+        return int(self.seen_filter_bits * math.log(2) ** 2 / -math.log(self.SEEN_FILTER_ERROR_RATE))
+
 
 settings = Settings()
@@ -35,3 +35,13 @@ class SelfMatchException(BaseProjectException):
 class PermissionDeniedException(BaseProjectException):
     default_message = "You don't have acces to object"
     status_code = status.HTTP_403_FORBIDDEN
+
+
+class BlockedUserException(BaseProjectException):
+    default_message = "User is blocked"
+    status_code = status.HTTP_403_FORBIDDEN
+
+
+class InvalidCursorException(BaseProjectException):
+    default_message = "Invalid cursor"
+    status_code = status.HTTP_400_BAD_REQUEST
@@ -6,12 +6,16 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.models import AuthUser
-from src.exceptions import AlreadyExistsException, SelfLikeException
+from src.exceptions import AlreadyExistsException, BlockedUserException, SelfLikeException
 from src.likes.models import UserLike
+from src.likes.redis import mark_seen
 from src.likes.schemas import UserLikeRequest
+from src.questionnaire import blacklist
 
 
 async def add_like(user: AuthUser, user_like: UserLikeRequest, session: AsyncSession):
+    if await blacklist.is_blocked(user.id, user_like.liked_user_id, session):
+        raise BlockedUserException
     stmt = (
         insert(UserLike)
         .values(
@@ -27,9 +31,10 @@ async def add_like(user: AuthUser, user_like: UserLikeRequest, session: AsyncSes
     try:
         like = (await session.execute(stmt)).scalar_one_or_none()
         await session.commit()
-        return like
     except SQLAlchemyError:
         return None
+    await mark_seen(user.id, user_like.liked_user_id)
+    return like
 
 
 async def get_all_likes(session: AsyncSession) -> list[UserLike]:
@@ -61,12 +66,15 @@ async def create_like(
 
     like = (await session.execute(stmt)).scalar_one_or_none()
     await session.commit()
+    await mark_seen(like.user_id, like.liked_user_id)
     return like
 
 
 async def check_like_data(session: AsyncSession, like_data: UserLikeRequest):
     if like_data.liked_user_id == like_data.user_id:
         raise SelfLikeException
+    if await blacklist.is_blocked(like_data.user_id, like_data.liked_user_id, session):
+        raise BlockedUserException
 
     likes = await get_all_likes(session)
     if [
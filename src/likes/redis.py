@@ -0,0 +1,72 @@
+import hashlib
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.likes.models import UserLike
+from src.redis.redis import redis as redis_client
+
+# bits are only set on a filter that is already there, a missing one is built from the db
+MARK_SEEN_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for _, position in ipairs(ARGV) do
+    redis.call('SETBIT', KEYS[1], position, 1)
+end
+return 1
+"""
+mark_seen_script = redis_client.register_script(MARK_SEEN_SCRIPT)
+
+
+def _seen_key(user_id: uuid.UUID) -> str:
+    return f"seen_{user_id}"
+
+
+def _bit_positions(quest_user_id: uuid.UUID) -> list[int]:
+    """Positions for the bloom filter, k hashes made from two by double hashing."""
+    digest = hashlib.blake2b(quest_user_id.bytes, digest_size=16).digest()
+    first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+    bits = settings.seen_filter_bits
+    return [(first + i * second) % bits for i in range(settings.seen_filter_hashes)]
+
+
+async def _build_seen_filter(user_id: uuid.UUID, session: AsyncSession) -> set[uuid.UUID]:
+    query = select(UserLike.liked_user_id).where(UserLike.user_id == user_id)
+    seen = set((await session.execute(query)).scalars())
+    positions = [position for seen_id in seen for position in _bit_positions(seen_id)]
+    # sized up front, so a filter of a user who hasn't swiped yet exists as well
+    await redis_client.setbits(_seen_key(user_id), positions, size=settings.seen_filter_bits)
+    return seen
+
+
+async def mark_seen(user_id: uuid.UUID, quest_user_id: uuid.UUID) -> None:
+    """Put a liked or disliked user into the filter, call it once the like is committed."""
+    await mark_seen_script(keys=[_seen_key(user_id)], args=_bit_positions(quest_user_id))
+
+
+async def filter_unseen(
+    user_id: uuid.UUID,
+    quest_user_ids: list[uuid.UUID],
+    session: AsyncSession,
+) -> list[bool]:
+    """
+    Which of the users the user has not liked or disliked yet.
+    False positives at SEEN_FILTER_ERROR_RATE hide a few unseen profiles, nothing seen comes back.
+    """
+    if not quest_user_ids:
+        return []
+
+    positions = [_bit_positions(quest_user_id) for quest_user_id in quest_user_ids]
+    bits = await redis_client.getbits(
+        _seen_key(user_id),
+        [position for user_positions in positions for position in user_positions],
+    )
+    if bits is None:
+        seen = await _build_seen_filter(user_id, session)
+        return [quest_user_id not in seen for quest_user_id in quest_user_ids]
+
+    hashes = settings.seen_filter_hashes
+    return [not all(bits[i * hashes:(i + 1) * hashes]) for i in range(len(quest_user_ids))]
@@ -0,0 +1,35 @@
+import base64
+import uuid
+from datetime import datetime
+
+import orjson
+
+from src.exceptions import InvalidCursorException
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Pack the (created_at, id) of the last row of a page into an opaque cursor."""
+    raw = orjson.dumps([created_at.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    Unpack a cursor made by encode_cursor.
+    Timestamps in the db are naive UTC, so an aware one can't come from us.
+    """
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        created_at, row_id = orjson.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (TypeError, ValueError):
+        raise InvalidCursorException from None
+    if not isinstance(created_at, str) or not isinstance(row_id, str):
+        raise InvalidCursorException
+
+    try:
+        created_at, row_id = datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except ValueError:
+        raise InvalidCursorException from None
+    if created_at.tzinfo is not None:
+        raise InvalidCursorException
+    return created_at, row_id
@@ -0,0 +1,51 @@
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.questionnaire.models import BlackListUser
+from src.redis.redis import redis as redis_client
+
+BLOCKED_TTL = 60 * 60
+# stored along with the ids, so a user who blocked nobody still has a cached set
+LOADED_MARK = "-"
+
+
+def _blocked_key(user_id: uuid.UUID) -> str:
+    return f"blocked_{user_id}"
+
+
+async def _load_blocked_ids(user_id: uuid.UUID, session: AsyncSession) -> set[uuid.UUID]:
+    """Users blocked by the user and users who blocked the user: they must not meet either way."""
+    query = (
+        select(BlackListUser.blocked_id).where(BlackListUser.blocked_by_id == user_id)
+        .union(select(BlackListUser.blocked_by_id).where(BlackListUser.blocked_id == user_id))
+    )
+    blocked_ids = set((await session.execute(query)).scalars())
+    await redis_client.sadd(
+        _blocked_key(user_id),
+        LOADED_MARK,
+        *(str(blocked_id) for blocked_id in blocked_ids),
+        ex=BLOCKED_TTL,
+    )
+    return blocked_ids
+
+
+async def get_blocked_ids(user_id: uuid.UUID, session: AsyncSession) -> set[uuid.UUID]:
+    members = await redis_client.smembers(_blocked_key(user_id))
+    if LOADED_MARK not in members:
+        return await _load_blocked_ids(user_id, session)
+    return {uuid.UUID(member) for member in members if member != LOADED_MARK}
+
+
+async def is_blocked(user_id: uuid.UUID, other_id: uuid.UUID, session: AsyncSession) -> bool:
+    """Whether either of the users has blocked the other, a single set lookup once cached."""
+    loaded, blocked = await redis_client.smismember(_blocked_key(user_id), LOADED_MARK, str(other_id))
+    if not loaded:
+        return other_id in await _load_blocked_ids(user_id, session)
+    return blocked
+
+
+async def drop_blocked(*user_ids: uuid.UUID) -> None:
+    """Forget the cached sets once a block between the users is added, changed or removed."""
+    await redis_client.delete(*(_blocked_key(user_id) for user_id in user_ids))
@@ -1,20 +1,134 @@
+from collections.abc import Mapping, Sequence
 from datetime import date
+from typing import Any
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, delete, select, update
-from sqlalchemy.exc import ProgrammingError
+from sqlalchemy import and_, delete, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.auth.models import AuthUser
+from src.auth.models import AGE_MAX, AGE_MIN, RANGE_MAX, RANGE_MIN, AuthUser, UserSettings
 from src.database import async_session_maker
-from src.likes.models import UserLike
-from src.questionnaire.models import UserQuestionnaire, UserQuestionnaireHobby
+from src.exceptions import NotFoundException
+from src.likes import redis as seen
+from src.pagination import decode_cursor, encode_cursor
+from src.questionnaire import blacklist, geo, hobbies, quota, ranking
+from src.questionnaire import redis as candidates
+from src.questionnaire.models import UserQuestionnaire
+from src.questionnaire.params_choice import Gender
 from src.questionnaire.schemas import (
     CreateUserQuestionnaireSchema,
+    QuestionnaireLocationSchema,
+    QuestionnairePageSchema,
     ResponseUserQuestionnaireSchema,
 )
 
+FEED_PAGE_SIZE = 5
+# rows fetched per feed page, some of them are dropped as already seen
+SEEN_OVERSAMPLE = 3
+
+DEFAULT_SEARCH_SETTINGS = {
+    "search_range_min": RANGE_MIN,
+    "search_range_max": RANGE_MAX,
+    "search_age_min": AGE_MIN,
+    "search_age_max": AGE_MAX,
+    "timezone": quota.DEFAULT_TIMEZONE,
+}
+
+
+async def _get_search_settings(user_id: UUID, session: AsyncSession) -> Mapping[str, Any]:
+    query = (
+        select(
+            UserSettings.search_range_min,
+            UserSettings.search_range_max,
+            UserSettings.search_age_min,
+            UserSettings.search_age_max,
+            UserSettings.timezone,
+        )
+        .where(UserSettings.user_id == user_id)
+    )
+    return (await session.execute(query)).mappings().first() or DEFAULT_SEARCH_SETTINGS
+
+
+def _years_before(day: date, years: int) -> date:
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        # 29 February in a non-leap year
+        return day.replace(year=day.year - years, day=28)
+
+
+def _age_filters(search_settings: Mapping[str, Any]) -> list:
+    """
+    Ages from search_age_min to search_age_max as a birthday range,
+    so the index on birthday is used instead of computing every row's age.
+    """
+    today = date.today()
+    return [
+        UserQuestionnaire.birthday <= _years_before(today, search_settings["search_age_min"]),
+        UserQuestionnaire.birthday > _years_before(today, search_settings["search_age_max"] + 1),
+    ]
+
+
+def _location_filters(user_questionnaire: UserQuestionnaire, search_settings: Mapping[str, Any]) -> list:
+    """
+    Questionnaires within the user's search range once the user has shared a location,
+    from the same city otherwise.
+    """
+    if user_questionnaire.latitude is None or user_questionnaire.longitude is None:
+        return [UserQuestionnaire.city == user_questionnaire.city]
+
+    return geo.within_range(
+        UserQuestionnaire.latitude,
+        UserQuestionnaire.longitude,
+        UserQuestionnaire.geohash,
+        user_questionnaire.latitude,
+        user_questionnaire.longitude,
+        search_settings["search_range_min"],
+        search_settings["search_range_max"],
+    )
+
+
+def _feed_filters(
+    user_questionnaire: UserQuestionnaire,
+    search_settings: Mapping[str, Any],
+    blocked_ids: set[UUID],
+) -> list:
+    """Conditions every questionnaire shown in the feed has to satisfy."""
+    is_visible = True
+    # equality instead of != keeps gender usable as an index column
+    genders = [gender for gender in Gender if gender != user_questionnaire.gender]
+    return [
+        UserQuestionnaire.user_id != user_questionnaire.user_id,
+        *_location_filters(user_questionnaire, search_settings),
+        UserQuestionnaire.gender.in_(genders),
+        *_age_filters(search_settings),
+        UserQuestionnaire.is_visible == is_visible,
+        UserQuestionnaire.user_id.notin_(blocked_ids),
+    ]
+
+
+async def _drop_seen(user_id: UUID, rows: Sequence, session: AsyncSession) -> list:
+    """
+    Leave out the users already liked or disliked. The bloom filter replaces a NOT IN over
+    all the user's likes, which grows with every swipe, so callers fetch a larger batch.
+    """
+    unseen = await seen.filter_unseen(user_id, [row.user_id for row in rows], session)
+    return [row for row, is_unseen in zip(rows, unseen, strict=True) if is_unseen]
+
+
+def _rank_candidates(user_questionnaire: UserQuestionnaire, rows: Sequence) -> list:
+    """Order the candidates from the most to the least compatible with the user."""
+    return [rows[index] for index in ranking.rank(user_questionnaire, rows)]
+
+
+async def _take_feed_list(user_questionnaire: UserQuestionnaire, search_settings: Mapping[str, Any]) -> bool:
+    return await quota.take_feed_list(
+        user_questionnaire.user_id,
+        search_settings["timezone"],
+        is_prem=user_questionnaire.is_prem,
+    )
+
 
 async def get_list_questionnaire(
     user: AuthUser,
@@ -22,30 +136,158 @@ async def get_list_questionnaire(
     page_number: int,
 ):
     user_questionnaire = await get_questionnaire(user_id=user.id, session=session)
-    if user_questionnaire.quest_lists_per_day >= 3:
+    search_settings = await _get_search_settings(user.id, session)
+    blocked_ids = await blacklist.get_blocked_ids(user.id, session)
+    if not await _take_feed_list(user_questionnaire, search_settings):
         return []
 
-    user_questionnaire.quest_lists_per_day += 1
-    await session.commit()
-
-    is_visible = True
-    liked_user_ids = (
-        select(UserLike.liked_user_id)
-        .where(UserLike.user_id == user.id)
+    query = (
+        select(UserQuestionnaire)
+        .where(*_feed_filters(user_questionnaire, search_settings, blocked_ids))
+        .limit(FEED_PAGE_SIZE * SEEN_OVERSAMPLE).offset(page_number)
     )
+    result = await session.execute(query)
+    return (await _drop_seen(user.id, result.scalars().fetchall(), session))[:FEED_PAGE_SIZE]
+
+
+async def get_list_questionnaire_by_cursor(
+    user: AuthUser,
+    session: AsyncSession,
+    cursor: str | None,
+) -> QuestionnairePageSchema:
+    """Getting the next feed page after the cursor, seeking by (created_at, id)."""
+    after = decode_cursor(cursor) if cursor is not None else None
+    user_questionnaire = await get_questionnaire(user_id=user.id, session=session)
+    search_settings = await _get_search_settings(user.id, session)
+    blocked_ids = await blacklist.get_blocked_ids(user.id, session)
+    if not await _take_feed_list(user_questionnaire, search_settings):
+        return QuestionnairePageSchema(items=[], next_cursor=None)
+
+    batch_size = FEED_PAGE_SIZE * SEEN_OVERSAMPLE
     query = (
         select(UserQuestionnaire)
-        .where(
-            UserQuestionnaire.user_id != user.id,
-            UserQuestionnaire.city == user_questionnaire.city,
-            UserQuestionnaire.gender != user_questionnaire.gender,
-            UserQuestionnaire.is_visible == is_visible,
-            UserQuestionnaire.user_id.notin_(liked_user_ids),
+        .where(*_feed_filters(user_questionnaire, search_settings, blocked_ids))
+        .order_by(UserQuestionnaire.created_at, UserQuestionnaire.id)
+        .limit(batch_size)
+    )
+    if after is not None:
+        query = query.where(
+            tuple_(UserQuestionnaire.created_at, UserQuestionnaire.id) > tuple_(*after),
+        )
+    batch = (await session.execute(query)).scalars().fetchall()
+    items = (await _drop_seen(user.id, batch, session))[:FEED_PAGE_SIZE]
+
+    next_cursor = None
+    if len(items) == FEED_PAGE_SIZE:
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    elif len(batch) == batch_size:
+        # most of the batch had been seen, the next page goes on after all of it
+        next_cursor = encode_cursor(batch[-1].created_at, batch[-1].id)
+    return QuestionnairePageSchema(items=items, next_cursor=next_cursor)
+
+
+async def fill_candidate_queue(
+    user_questionnaire: UserQuestionnaire,
+    session: AsyncSession,
+) -> None:
+    """
+    Run the heavy feed filter once and queue the next batch of eligible questionnaire ids,
+    the most compatible first. The scan continues after the last queued row, so nothing is
+    queued twice; it starts over only once the remembered position has expired and the queue is empty.
+    """
+    user_id = user_questionnaire.user_id
+    after = await candidates.get_candidates_cursor(user_id)
+    if after is None and await candidates.count_candidates(user_id):
+        return
+
+    search_settings = await _get_search_settings(user_id, session)
+    blocked_ids = await blacklist.get_blocked_ids(user_id, session)
+    query = (
+        select(
+            UserQuestionnaire.id,
+            UserQuestionnaire.created_at,
+            UserQuestionnaire.user_id,
+            UserQuestionnaire.goals,
+            UserQuestionnaire.sport,
+            UserQuestionnaire.smoking,
+            UserQuestionnaire.alcohol,
+            UserQuestionnaire.height,
+            UserQuestionnaire.birthday,
+            UserQuestionnaire.hobby_ids,
         )
-        .limit(5).offset(page_number)
+        .where(*_feed_filters(user_questionnaire, search_settings, blocked_ids))
+        .order_by(UserQuestionnaire.created_at, UserQuestionnaire.id)
+        .limit(candidates.CANDIDATE_QUEUE_SIZE)
     )
-    result = await session.execute(query)
-    return result.scalars().fetchall()
+    if after is not None:
+        query = query.where(
+            tuple_(UserQuestionnaire.created_at, UserQuestionnaire.id) > tuple_(*after),
+        )
+    rows = (await session.execute(query)).all()
+    if rows:
+        unseen = await _drop_seen(user_id, rows, session)
+        await candidates.push_candidates(
+            user_id,
+            [row.id for row in _rank_candidates(user_questionnaire, unseen)],
+            after=(rows[-1].created_at, rows[-1].id),
+        )
+
+
+async def refill_candidate_queue(user_id: UUID) -> None:
+    """Top up the user's candidate queue in the background once it runs low."""
+    if await candidates.count_candidates(user_id) >= candidates.CANDIDATE_QUEUE_LOW:
+        return
+    if not await candidates.lock_candidates_refill(user_id):
+        return
+    try:
+        async with async_session_maker() as session:
+            user_questionnaire = await get_questionnaire(user_id=user_id, session=session)
+            if user_questionnaire:
+                await fill_candidate_queue(user_questionnaire, session)
+    finally:
+        await candidates.unlock_candidates_refill(user_id)
+
+
+async def get_feed_questionnaire(
+    user: AuthUser,
+    session: AsyncSession,
+) -> list[UserQuestionnaire]:
+    """
+    Getting the next feed page from the precomputed candidate queue.
+    A feed list is only spent when the page is not empty.
+    """
+    user_questionnaire = await get_questionnaire(user_id=user.id, session=session)
+    search_settings = await _get_search_settings(user.id, session)
+    blocked_ids = await blacklist.get_blocked_ids(user.id, session)
+    if not await _take_feed_list(user_questionnaire, search_settings):
+        return []
+
+    if (
+        await candidates.count_candidates(user.id) < FEED_PAGE_SIZE
+        and await candidates.lock_candidates_refill(user.id)
+    ):
+        try:
+            await fill_candidate_queue(user_questionnaire, session)
+        finally:
+            await candidates.unlock_candidates_refill(user.id)
+
+    feed = []
+    quest_ids = list(dict.fromkeys(await candidates.pop_candidates(user.id, FEED_PAGE_SIZE)))
+    if quest_ids:
+        # queued ids may be stale, so the cheap part of the filter is checked again on them
+        query = select(UserQuestionnaire).where(
+            UserQuestionnaire.id.in_(quest_ids),
+            *_feed_filters(user_questionnaire, search_settings, blocked_ids),
+        )
+        fetched = (await session.execute(query)).scalars().fetchall()
+        questionnaires = {
+            questionnaire.id: questionnaire
+            for questionnaire in await _drop_seen(user.id, fetched, session)
+        }
+        feed = [questionnaires[quest_id] for quest_id in quest_ids if quest_id in questionnaires]
+    if not feed:
+        await quota.give_back_feed_list(user.id, search_settings["timezone"])
+    return feed
 
 
 async def create_questionnaire(
@@ -74,13 +316,10 @@ async def create_questionnaire(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Возрастное ограничение строго c 18 лет!",
         )
-    hobbies = user_profile.hobbies
-    for hobby in hobbies:
-        hobby_obj = UserQuestionnaireHobby(hobby_name=hobby.hobby_name)
-        questionnaire.hobbies.append(hobby_obj)
+    await hobbies.set_hobbies(questionnaire, [hobby.hobby_name for hobby in user_profile.hobbies], session)
     session.add(questionnaire)
     await session.commit()
-    return ResponseUserQuestionnaireSchema(**questionnaire.__dict__)
+    return ResponseUserQuestionnaireSchema.from_orm(questionnaire)
 
 
 async def update_questionnaire(
@@ -103,12 +342,27 @@ async def update_questionnaire(
         .returning(UserQuestionnaire)
     )
     await session.execute(stmt)
-    questionnaire.hobbies = []
-    for hobby in update_value.hobbies:
-        hobby_item = UserQuestionnaireHobby(hobby_name=hobby.hobby_name)
-        questionnaire.hobbies.append(hobby_item)
+    await hobbies.set_hobbies(questionnaire, [hobby.hobby_name for hobby in update_value.hobbies], session)
+    await session.commit()
+    await candidates.drop_candidates(user.id)
+    return ResponseUserQuestionnaireSchema.from_orm(questionnaire)
+
+
+async def update_location(
+    location: QuestionnaireLocationSchema,
+    session: AsyncSession,
+    user: AuthUser,
+) -> QuestionnaireLocationSchema:
+    """Save the user's coordinates, the feed then searches by distance instead of by city."""
+    user_questionnaire = await get_questionnaire(user_id=user.id, session=session)
+    if not user_questionnaire:
+        raise NotFoundException("Questionnaire not found")
+    user_questionnaire.latitude = location.latitude
+    user_questionnaire.longitude = location.longitude
+    user_questionnaire.geohash = geo.encode_geohash(location.latitude, location.longitude)
     await session.commit()
-    return ResponseUserQuestionnaireSchema(**questionnaire.__dict__)
+    await candidates.drop_candidates(user.id)
+    return location
 
 
 async def delete_quest(
@@ -128,6 +382,7 @@ async def delete_quest(
         )
         await session.execute(query_questionnaire)
         await session.commit()
+        await candidates.drop_candidates(user.id)
     else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -142,16 +397,3 @@ async def get_questionnaire(user_id: UUID, session: AsyncSession):
     if response:
         return response
     return None
-
-
-async def reset_quest_lists_per_day():
-    try:
-        async with async_session_maker() as session:
-            stmt = (
-                update(UserQuestionnaire)
-                .values(quest_lists_per_day=0)
-            )
-            await session.execute(stmt)
-            await session.commit()
-    except ProgrammingError:
-        pass
@@ -0,0 +1,135 @@
+import math
+
+from sqlalchemy import Float, and_, cast, func, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+GEOHASH_PRECISION = 9
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+# sorts after every geohash character, closes the range of a cell prefix
+GEOHASH_UPPER = "~"
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Geohash of a point: nearby points share a prefix, so a cell is a range of the index."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash, char, bit, even = [], 0, 0, True
+    while len(geohash) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        char <<= 1
+        if value >= middle:
+            char |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit += 1
+        if bit == 5:
+            geohash.append(GEOHASH_ALPHABET[char])
+            char, bit = 0, 0
+    return "".join(geohash)
+
+
+def _cell_size(precision: int) -> tuple[float, float]:
+    """Height and width of a geohash cell in degrees."""
+    bits = precision * 5
+    return 180 / 2 ** (bits // 2), 360 / 2 ** (bits - bits // 2)
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> tuple[float, float, float, float] | None:
+    """
+    Min/max latitude and longitude around a point.
+    None when the box reaches a pole or the antimeridian and can't be expressed as two ranges.
+    """
+    lat_delta = radius_km / KM_PER_DEGREE
+    if abs(latitude) + lat_delta >= 90:
+        return None
+    lon_delta = radius_km / (KM_PER_DEGREE * math.cos(math.radians(abs(latitude) + lat_delta)))
+    if abs(longitude) + lon_delta >= 180:
+        return None
+    return latitude - lat_delta, latitude + lat_delta, longitude - lon_delta, longitude + lon_delta
+
+
+def geohash_cells(latitude: float, longitude: float, radius_km: float) -> list[str] | None:
+    """
+    Geohash prefixes covering the circle: the finest cell not smaller than the radius
+    plus its neighbours. None when the circle is too large or the box can't be built.
+    """
+    box = bounding_box(latitude, longitude, radius_km)
+    if box is None:
+        return None
+
+    lat_km = KM_PER_DEGREE
+    lon_km = KM_PER_DEGREE * math.cos(math.radians(max(abs(box[0]), abs(box[1]))))
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        height, width = _cell_size(candidate)
+        if height * lat_km < radius_km or width * lon_km < radius_km:
+            break
+        precision = candidate
+    if precision == 0:
+        return None
+
+    height, width = _cell_size(precision)
+    return sorted({
+        encode_geohash(
+            min(max(latitude + lat_step * height, -90.0), 90.0),
+            longitude + lon_step * width,
+            precision,
+        )
+        for lat_step in (-1, 0, 1)
+        for lon_step in (-1, 0, 1)
+    })
+
+
+def haversine_km(
+    lat1: ColumnElement | float,
+    lon1: ColumnElement | float,
+    lat2: ColumnElement | float,
+    lon2: ColumnElement | float,
+) -> ColumnElement:
+    """Great-circle distance between two points as an SQL expression."""
+    lat1, lon1, lat2, lon2 = (func.radians(cast(value, Float)) for value in (lat1, lon1, lat2, lon2))
+    chord = (
+        func.power(func.sin((lat2 - lat1) / 2), 2)
+        + func.cos(lat1) * func.cos(lat2) * func.power(func.sin((lon2 - lon1) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(chord, 1.0)))
+
+
+def within_range(
+    latitude_column: ColumnElement,
+    longitude_column: ColumnElement,
+    geohash_column: ColumnElement,
+    latitude: float,
+    longitude: float,
+    range_min: float,
+    range_max: float,
+) -> list[ColumnElement]:
+    """
+    Conditions for rows whose point lies between range_min and range_max km from the given one.
+    The geohash cells and the bounding box narrow the rows down through the indexes,
+    the exact haversine check runs only on what is left.
+    """
+    latitude, longitude = float(latitude), float(longitude)
+    conditions = []
+    cells = geohash_cells(latitude, longitude, range_max)
+    if cells is not None:
+        conditions.append(or_(*(
+            and_(geohash_column >= cell, geohash_column < cell + GEOHASH_UPPER)
+            for cell in cells
+        )))
+    box = bounding_box(latitude, longitude, range_max)
+    if box is not None:
+        min_lat, max_lat, min_lon, max_lon = box
+        conditions.extend([
+            latitude_column.between(min_lat, max_lat),
+            longitude_column.between(min_lon, max_lon),
+        ])
+    distance = haversine_km(latitude_column, longitude_column, latitude, longitude)
+    conditions.append(distance <= range_max)
+    if range_min > 0:
+        conditions.append(distance >= range_min)
+    return conditions
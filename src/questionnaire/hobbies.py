@@ -0,0 +1,50 @@
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.questionnaire.models import Hobby, UserQuestionnaire
+
+
+def hobby_key(hobby_name: str) -> str:
+    return " ".join(hobby_name.split()).casefold()
+
+
+def hobby_mask(hobby_ids: Iterable[int]) -> int:
+    """The hobby ids as a bitset, shared hobbies are then a bitwise and."""
+    mask = 0
+    for hobby_id in hobby_ids:
+        mask |= 1 << hobby_id
+    return mask
+
+
+async def get_or_create_hobbies(hobby_names: Iterable[str], session: AsyncSession) -> list[Hobby]:
+    """Dictionary entries of the hobbies in the given order, the new ones are added to the dictionary."""
+    names = {}
+    for hobby_name in hobby_names:
+        if key := hobby_key(hobby_name):
+            names.setdefault(key, " ".join(hobby_name.split()))
+    if not names:
+        return []
+
+    await session.execute(
+        insert(Hobby)
+        .values([{"key": key, "name": name} for key, name in names.items()])
+        .on_conflict_do_nothing(index_elements=[Hobby.key]),
+    )
+    hobbies = (await session.execute(select(Hobby).where(Hobby.key.in_(names)))).scalars()
+    by_key = {hobby.key: hobby for hobby in hobbies}
+    return [by_key[key] for key in names]
+
+
+async def set_hobbies(
+    questionnaire: UserQuestionnaire,
+    hobby_names: Iterable[str],
+    session: AsyncSession,
+) -> None:
+    hobbies = await get_or_create_hobbies(hobby_names, session)
+    questionnaire.hobby_ids = [hobby.id for hobby in hobbies]
+    # the names are known already, no need to select them back with the questionnaire
+    set_committed_value(questionnaire, "hobby_names", [hobby.name for hobby in hobbies])
@@ -3,14 +3,18 @@ from datetime import date, datetime
 
 from sqlalchemy import (
     CheckConstraint,
-    Column,
     ForeignKey,
+    Index,
+    Integer,
     Numeric,
     String,
-    Table,
     UniqueConstraint,
+    any_,
+    func,
+    select,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 from sqlalchemy_utils import ChoiceType
 
 from src.auth.models import AuthUser
@@ -45,26 +49,24 @@ class BlackListUser(Base):
     )
 
 
-user_hobby = Table(
-    "user_hobby",
-    Base.metadata,
-    Column(
-        "user_id",
-        ForeignKey("user_questionnaire.id", ondelete="CASCADE"),
-        primary_key=True,
-    ),
-    Column(
-        "hobby_id",
-        ForeignKey("user_questionnaire_hobby.id", ondelete="CASCADE"),
-        primary_key=True,
-    ),
-)
+class Hobby(Base):
+    """The hobby dictionary, questionnaires keep the ids of their hobbies."""
+
+    __tablename__ = "hobby"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # the name lowercased with whitespace collapsed, two spellings of a hobby share an entry
+    key: Mapped[str] = mapped_column(String(length=256), nullable=False, unique=True)
+    name: Mapped[str] = mapped_column(String(length=256), nullable=False)
 
 
 class UserQuestionnaire(Base):
     __tablename__ = "user_questionnaire"
     __table_args__ = (
         UniqueConstraint("user_id", name="_user_id_uc"),
+        Index("ix_user_questionnaire_city_created_at_id", "city", "created_at", "id"),
+        Index("ix_user_questionnaire_geohash", "geohash"),
+        Index("ix_user_questionnaire_city_gender_birthday", "city", "gender", "birthday"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
@@ -72,7 +74,6 @@ class UserQuestionnaire(Base):
         default=datetime.utcnow,
     )
     is_prem: Mapped[bool] = mapped_column(default=False, nullable=False)
-    quest_lists_per_day: Mapped[int] = mapped_column(default=0, nullable=False)
     firstname: Mapped[str] = mapped_column(String(length=256), nullable=True)
     lastname: Mapped[str] = mapped_column(String(length=256), nullable=True)
     gender: Mapped[str] = mapped_column(ChoiceType(Gender), nullable=True)
@@ -81,6 +82,8 @@ class UserQuestionnaire(Base):
     city: Mapped[str] = mapped_column(String, nullable=True)  # апи + live search
     latitude: Mapped[Numeric] = mapped_column(Numeric(8, 5), nullable=True)
     longitude: Mapped[Numeric] = mapped_column(Numeric(8, 5), nullable=True)
+    # "C" collation keeps the btree in byte order, so a geohash cell is a plain index range
+    geohash: Mapped[str] = mapped_column(String(length=12, collation="C"), nullable=True)
     about: Mapped[str] = mapped_column(String, nullable=True)
     height: Mapped[int] = mapped_column(nullable=True)
     goals: Mapped[str] = mapped_column(ChoiceType(Goal), nullable=True)
@@ -89,11 +92,20 @@ class UserQuestionnaire(Base):
     alcohol: Mapped[str] = mapped_column(ChoiceType(AlcoholType), nullable=False)
     is_visible: Mapped[bool] = mapped_column(default=True, nullable=False)
     birthday: Mapped[date] = mapped_column(nullable=False)
-    hobbies: Mapped[list["UserQuestionnaireHobby"]] = relationship(
-        secondary=user_hobby,
-        lazy="selectin",
-        cascade="all,delete-orphan",
-        single_parent=True,
+    hobby_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer),
+        default=list,
+        server_default="{}",
+        nullable=False,
+    )
+    # selected together with the questionnaire, in the order of hobby_ids;
+    # kept over flushes, hobbies.set_hobbies fills it in whenever hobby_ids change
+    hobby_names: Mapped[list[str]] = column_property(
+        select(func.array_agg(aggregate_order_by(Hobby.name, func.array_position(hobby_ids, Hobby.id))))
+        .where(Hobby.id == any_(hobby_ids))
+        .correlate_except(Hobby)
+        .scalar_subquery(),
+        expire_on_flush=False,
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("auth_user.id", ondelete="CASCADE"),
@@ -101,9 +113,6 @@ class UserQuestionnaire(Base):
     )
     user = relationship("AuthUser", back_populates="questionnaire")
 
-
-class UserQuestionnaireHobby(Base):
-    __tablename__ = "user_questionnaire_hobby"
-
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
-    hobby_name: Mapped[str] = mapped_column(String(length=256), nullable=False)
+    @property
+    def hobbies(self) -> list[dict[str, str]]:
+        return [{"hobby_name": hobby_name} for hobby_name in self.hobby_names or []]
@@ -0,0 +1,75 @@
+import uuid
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from src.redis.redis import redis as redis_client
+
+FEED_LISTS_PER_DAY = 3
+PREMIUM_FEED_LISTS_PER_DAY = 10
+DEFAULT_TIMEZONE = "UTC"
+
+# INCR and the limit check in one step, so parallel requests can't both take the last list
+TAKE_SCRIPT = """
+local used = redis.call('INCR', KEYS[1])
+if used == 1 then
+    redis.call('EXPIREAT', KEYS[1], ARGV[2])
+end
+if used > tonumber(ARGV[1]) then
+    redis.call('DECR', KEYS[1])
+    return 0
+end
+return 1
+"""
+# a counter that has already expired must not come back without a ttl
+GIVE_BACK_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('DECR', KEYS[1])
+end
+return 0
+"""
+take_script = redis_client.register_script(TAKE_SCRIPT)
+give_back_script = redis_client.register_script(GIVE_BACK_SCRIPT)
+
+
+def _zone(timezone: str | None) -> ZoneInfo:
+    try:
+        return ZoneInfo(timezone or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def _today(timezone: str | None) -> tuple[str, int]:
+    """The user's local date and the unix time of the local midnight that ends it."""
+    zone = _zone(timezone)
+    today = datetime.now(tz=zone).date()
+    midnight = datetime.combine(today + timedelta(days=1), time(), tzinfo=zone)
+    return today.isoformat(), int(midnight.timestamp())
+
+
+def _quota_key(user_id: uuid.UUID, day: str) -> str:
+    return f"feed_lists_{user_id}_{day}"
+
+
+def feed_lists_limit(*, is_prem: bool) -> int:
+    return PREMIUM_FEED_LISTS_PER_DAY if is_prem else FEED_LISTS_PER_DAY
+
+
+async def take_feed_list(user_id: uuid.UUID, timezone: str | None, *, is_prem: bool) -> bool:
+    """
+    Spend one of the feed lists the user has for today.
+    The counter is keyed by the user's local date and expires at the local midnight.
+    """
+    day, midnight = _today(timezone)
+    limit = feed_lists_limit(is_prem=is_prem)
+    return bool(await take_script(keys=[_quota_key(user_id, day)], args=[limit, midnight]))
+
+
+async def give_back_feed_list(user_id: uuid.UUID, timezone: str | None) -> None:
+    """Return a list taken by take_feed_list, e.g. when there was nothing to show."""
+    day, _ = _today(timezone)
+    await give_back_script(keys=[_quota_key(user_id, day)])
+
+
+async def used_feed_lists(user_id: uuid.UUID, timezone: str | None) -> int:
+    day, _ = _today(timezone)
+    return int(await redis_client.get(_quota_key(user_id, day)) or 0)
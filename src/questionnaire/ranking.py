@@ -0,0 +1,143 @@
+"""
+Compatibility ranking of feed candidates.
+
+A batch of candidates is encoded into numeric feature arrays once, then scored in a single
+NumPy pass: every feature gives a similarity to the viewer in [0, 1], and the score is the
+weighted sum of the similarities.
+"""
+from collections.abc import Mapping, Sequence
+from enum import Enum
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from src.config import settings
+from src.questionnaire.hobbies import hobby_mask
+from src.questionnaire.params_choice import AlcoholType, Goal, SmokingType, SportType
+
+FEATURES = ("goals", "sport", "smoking", "alcohol", "height", "age", "hobbies")
+DEFAULT_WEIGHTS = {
+    "goals": 3.0,
+    "sport": 1.0,
+    "smoking": 1.5,
+    "alcohol": 1.0,
+    "height": 0.5,
+    "age": 2.0,
+    "hobbies": 2.0,
+}
+# the choices are indexed in the order they are declared, the ordinal ones go from one extreme to the other
+CHOICES: dict[str, type[Enum]] = {
+    "goals": Goal,
+    "sport": SportType,
+    "smoking": SmokingType,
+    "alcohol": AlcoholType,
+}
+MISSING = -1
+# differences at which the height and the age similarity drop to zero
+HEIGHT_SCALE_CM = 30
+AGE_SCALE_DAYS = 10 * 365.25
+
+# the choices are str enums, so the members and the stored values look up the same index
+_CHOICE_INDEXES = {
+    field: {member: index for index, member in enumerate(choice)} for field, choice in CHOICES.items()
+}
+# how far apart the two ends of sport, smoking and alcohol are
+_ORDINAL_SPANS = np.array([len(choice) - 1 for choice in list(CHOICES.values())[1:]], dtype=np.float64)
+
+
+class Features(NamedTuple):
+    """Feature arrays of a batch of questionnaires, one row per questionnaire."""
+
+    choices: np.ndarray  # (n, 4) indexes of goals, sport, smoking, alcohol or MISSING
+    height: np.ndarray  # (n,) cm, nan if unknown
+    birthday: np.ndarray  # (n,) proleptic gregorian ordinal
+    shared_hobbies: np.ndarray  # (n,) how many of the viewer's hobbies the questionnaire has
+    hobbies: np.ndarray  # (n,) how many hobbies the questionnaire has
+
+
+def _choice_index(field: str, value: Any) -> int:
+    return _CHOICE_INDEXES[field].get(value, MISSING)
+
+
+def encode(questionnaires: Sequence[Any], viewer_hobbies: int) -> Features:
+    """
+    Questionnaires are anything with goals, sport, smoking, alcohol, height, birthday and hobby_ids,
+    viewer_hobbies is the hobby_mask of the viewer.
+    """
+    masks = [hobby_mask(questionnaire.hobby_ids) for questionnaire in questionnaires]
+    return Features(
+        choices=np.column_stack([
+            np.fromiter(
+                (indexes.get(getattr(questionnaire, field), MISSING) for questionnaire in questionnaires),
+                dtype=np.int8,
+                count=len(questionnaires),
+            )
+            for field, indexes in _CHOICE_INDEXES.items()
+        ]),
+        height=np.array(
+            [questionnaire.height for questionnaire in questionnaires],
+            dtype=np.float64,
+        ),
+        birthday=np.array(
+            [questionnaire.birthday.toordinal() for questionnaire in questionnaires],
+            dtype=np.float64,
+        ),
+        shared_hobbies=np.fromiter(
+            ((mask & viewer_hobbies).bit_count() for mask in masks),
+            dtype=np.float64,
+            count=len(masks),
+        ),
+        hobbies=np.fromiter((mask.bit_count() for mask in masks), dtype=np.float64, count=len(masks)),
+    )
+
+
+def ranking_weights(overrides: Mapping[str, float] | None = None) -> np.ndarray:
+    """Weights in FEATURES order, normalized to sum to one, so a score is within [0, 1]."""
+    if overrides is None:
+        overrides = settings.FEED_RANKING_WEIGHTS
+    unknown = set(overrides) - set(FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown ranking features: {', '.join(sorted(unknown))}")
+    weights = np.array([overrides.get(name, DEFAULT_WEIGHTS[name]) for name in FEATURES], dtype=np.float64)
+    if (weights < 0).any() or not weights.sum():
+        raise ValueError("Ranking weights must be non-negative and not all zero")
+    return weights / weights.sum()
+
+
+def score(viewer: Features, candidates: Features, weights: np.ndarray) -> np.ndarray:
+    """Scores of the candidates for the viewer, a one-row Features, as a (n,) array."""
+    choices, viewer_choices = candidates.choices, viewer.choices[0]
+    known = (choices != MISSING) & (viewer_choices != MISSING)
+
+    goals = (choices[:, 0] == viewer_choices[0]) & known[:, 0]
+    ordinals = 1 - np.abs(choices[:, 1:] - viewer_choices[1:]) / _ORDINAL_SPANS
+    ordinals[~known[:, 1:]] = 0
+
+    height = np.nan_to_num(1 - np.abs(candidates.height - viewer.height[0]) / HEIGHT_SCALE_CM, nan=0)
+    age = 1 - np.abs(candidates.birthday - viewer.birthday[0]) / AGE_SCALE_DAYS
+
+    # jaccard index of the hobbies
+    union = candidates.hobbies + viewer.hobbies[0] - candidates.shared_hobbies
+    hobbies = np.divide(
+        candidates.shared_hobbies,
+        union,
+        out=np.zeros_like(union),
+        where=union > 0,
+    )
+
+    similarities = np.column_stack((goals, ordinals, height, age, hobbies))
+    return np.clip(similarities, 0, 1) @ weights
+
+
+def rank(viewer: Any, questionnaires: Sequence[Any], weights: np.ndarray | None = None) -> list[int]:
+    """
+    Indexes of the questionnaires from the most to the least compatible with the viewer.
+    The sort is stable, so equally scored questionnaires keep their order.
+    """
+    if not questionnaires:
+        return []
+    if weights is None:
+        weights = ranking_weights()
+    viewer_hobbies = hobby_mask(viewer.hobby_ids)
+    scores = score(encode([viewer], viewer_hobbies), encode(questionnaires, viewer_hobbies), weights)
+    return np.argsort(-scores, kind="stable").tolist()
@@ -0,0 +1,67 @@
+import uuid
+from datetime import datetime
+
+from src.pagination import decode_cursor, encode_cursor
+from src.redis.redis import redis as redis_client
+
+CANDIDATE_QUEUE_SIZE = 300
+CANDIDATE_QUEUE_LOW = 50
+CANDIDATE_QUEUE_TTL = 60 * 60
+CANDIDATE_REFILL_LOCK_TTL = 30
+
+
+def _queue_key(user_id: uuid.UUID) -> str:
+    return f"feed_queue_{user_id}"
+
+
+def _cursor_key(user_id: uuid.UUID) -> str:
+    return f"feed_queue_cursor_{user_id}"
+
+
+def _lock_key(user_id: uuid.UUID) -> str:
+    return f"feed_queue_lock_{user_id}"
+
+
+async def count_candidates(user_id: uuid.UUID) -> int:
+    return await redis_client.llen(_queue_key(user_id))
+
+
+async def pop_candidates(user_id: uuid.UUID, count: int) -> list[uuid.UUID]:
+    """Take the next questionnaire ids from the head of the user's queue."""
+    return [uuid.UUID(quest_id) for quest_id in await redis_client.lpop(_queue_key(user_id), count)]
+
+
+async def push_candidates(
+    user_id: uuid.UUID,
+    quest_ids: list[uuid.UUID],
+    after: tuple[datetime, uuid.UUID],
+) -> None:
+    """Append questionnaire ids to the user's queue and remember where the scan stopped."""
+    if quest_ids:
+        await redis_client.rpush(
+            _queue_key(user_id),
+            *(str(quest_id) for quest_id in quest_ids),
+            ex=CANDIDATE_QUEUE_TTL,
+        )
+    await redis_client.set(_cursor_key(user_id), encode_cursor(*after), ex=CANDIDATE_QUEUE_TTL)
+
+
+async def get_candidates_cursor(user_id: uuid.UUID) -> tuple[datetime, uuid.UUID] | None:
+    cursor = await redis_client.get(_cursor_key(user_id))
+    if cursor is None:
+        return None
+    return decode_cursor(cursor)
+
+
+async def lock_candidates_refill(user_id: uuid.UUID) -> bool:
+    """Only one refill per user at a time, so the same ids are not queued twice."""
+    return await redis_client.set_if_not_exists(_lock_key(user_id), 1, ex=CANDIDATE_REFILL_LOCK_TTL)
+
+
+async def unlock_candidates_refill(user_id: uuid.UUID) -> None:
+    await redis_client.delete(_lock_key(user_id))
+
+
+async def drop_candidates(user_id: uuid.UUID) -> None:
+    """Forget the queue, e.g. when the user's own questionnaire changes."""
+    await redis_client.delete(_queue_key(user_id), _cursor_key(user_id))
@@ -1,8 +1,9 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, status
+from fastapi import APIRouter, Depends, Path, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTasks
 
 from src.auth.base_config import current_user
 from src.auth.models import AuthUser
@@ -10,6 +11,8 @@ from src.database import get_async_session
 from src.questionnaire import crud
 from src.questionnaire.schemas import (
     CreateUserQuestionnaireSchema,
+    QuestionnaireLocationSchema,
+    QuestionnairePageSchema,
     ResponseUserQuestionnaireSchema,
 )
 
@@ -45,6 +48,34 @@ async def get_list_questionnaire(
     return await crud.get_list_questionnaire(user, session, page_number)
 
 
+@router.get(
+    "/list",
+    response_model=QuestionnairePageSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def get_list_questionnaire_by_cursor(
+    user: Annotated[AuthUser, Depends(current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    cursor: Annotated[str | None, Query()] = None,
+):
+    return await crud.get_list_questionnaire_by_cursor(user, session, cursor)
+
+
+@router.get(
+    "/feed",
+    response_model=list[ResponseUserQuestionnaireSchema],
+    status_code=status.HTTP_200_OK,
+)
+async def get_feed_questionnaire(
+    user: Annotated[AuthUser, Depends(current_user)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    bg_tasks: BackgroundTasks,
+):
+    questionnaires = await crud.get_feed_questionnaire(user, session)
+    bg_tasks.add_task(crud.refill_candidate_queue, user.id)
+    return questionnaires
+
+
 @router.get(
     "/get_my_quest",
     response_model=ResponseUserQuestionnaireSchema,
@@ -57,6 +88,19 @@ async def get_questionnaire(
     return await crud.get_questionnaire(user.id, session)
 
 
+@router.put(
+    "/location",
+    response_model=QuestionnaireLocationSchema,
+    status_code=status.HTTP_200_OK,
+)
+async def update_location(
+    location: QuestionnaireLocationSchema,
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    user: Annotated[AuthUser, Depends(current_user)],
+):
+    return await crud.update_location(location, session, user)
+
+
 @router.patch(
     "/{quest_id}",
     response_model=ResponseUserQuestionnaireSchema,
@@ -1,7 +1,7 @@
 import uuid
 from datetime import date
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from .params_choice import AlcoholType, Gender, Goal, SmokingType, SportType
 
@@ -37,6 +37,16 @@ class ResponseUserQuestionnaireSchema(CreateUserQuestionnaireSchema):
     user_id: uuid.UUID | None = None
 
 
+class QuestionnairePageSchema(UserBaseSchema):
+    items: list[ResponseUserQuestionnaireSchema]
+    next_cursor: str | None = None
+
+
+class QuestionnaireLocationSchema(UserBaseSchema):
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+
+
 class ResponseQuestionnaireSchemaWithMatch(ResponseUserQuestionnaireSchema):
     is_match: bool = False
     match_id: uuid.UUID | None = None
@@ -1,6 +1,7 @@
 from typing import Any
 
 from redis.asyncio import Redis as AsyncRedis
+from redis.commands.core import AsyncScript
 
 from src.config import settings
 
@@ -21,11 +22,61 @@ class Redis:
             return data
         return None
 
-    async def set(self, name: str, value: Any):
-        await self.redis_client.set(name=name, value=value, ex=600)
+    async def set(self, name: str, value: Any, ex: int = 600):
+        await self.redis_client.set(name=name, value=value, ex=ex)
 
-    async def delete(self, name: str):
-        await self.redis_client.delete(name)
+    async def set_if_not_exists(self, name: str, value: Any, ex: int = 600) -> bool:
+        return bool(await self.redis_client.set(name=name, value=value, ex=ex, nx=True))
+
+    async def rpush(self, name: str, *values: Any, ex: int = 600):
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            await pipe.rpush(name, *values).expire(name, ex).execute()
+
+    async def lpop(self, name: str, count: int) -> list:
+        data: list | None = await self.redis_client.lpop(name=name, count=count)
+        if data:
+            return data
+        return []
+
+    async def llen(self, name: str) -> int:
+        return await self.redis_client.llen(name=name)
+
+    async def sadd(self, name: str, *values: Any, ex: int = 600):
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            await pipe.sadd(name, *values).expire(name, ex).execute()
+
+    async def smembers(self, name: str) -> set:
+        return await self.redis_client.smembers(name=name)
+
+    async def smismember(self, name: str, *values: Any) -> list[bool]:
+        return [bool(found) for found in await self.redis_client.smismember(name, values)]
+
+    async def setbits(self, name: str, positions: list[int], size: int = 0):
+        """Set the bits at the positions, size allocates the bitmap up front even when there are none."""
+        operation = self.redis_client.bitfield(name)
+        if size:
+            operation.set("u1", size - 1, 0)
+        for position in positions:
+            operation.set("u1", position, 1)
+        await operation.execute()
+
+    async def getbits(self, name: str, positions: list[int]) -> list[int] | None:
+        """Bits at the positions in one round trip, None when there is no such key."""
+        operation = self.redis_client.bitfield(name)
+        for position in positions:
+            operation.get("u1", position)
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            exists, bits = await pipe.exists(name).execute_command(*operation.command).execute()
+        if not exists:
+            return None
+        return bits
+
+    async def delete(self, *names: str):
+        await self.redis_client.delete(*names)
+
+    def register_script(self, script: str) -> AsyncScript:
+        """Lua script run by its sha, loaded into redis on the first call."""
+        return self.redis_client.register_script(script)
 
     async def flush_db(self):
         await self.redis_client.flushdb(asynchronous=True)
@@ -1,5 +1,6 @@
+import uuid
 from collections.abc import AsyncGenerator
-from datetime import datetime
+from datetime import date, datetime
 
 import pytest
 from async_asgi_testclient import TestClient
@@ -8,7 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.auth.models import AuthUser
 from src.likes.models import UserLike
 from src.matches.models import Match
-from src.questionnaire.models import UserQuestionnaire, UserQuestionnaireHobby
+from src.questionnaire.hobbies import set_hobbies
+from src.questionnaire.models import UserQuestionnaire
 
 """Without that tests will die, sa cant work with date and pytest same time normaly(kostil)"""
 date_string = "2004-02-14"
@@ -62,6 +64,21 @@ user3_questionary_data = {
     "birthday": date_object,
 }
 
+feed_questionnaire_data = {
+    "firstname": "Anton",
+    "lastname": "Pupkin",
+    "photo": "photo",
+    "country": "country",
+    "city": "feed_city",
+    "about": "about",
+    "goals": "Дружба",
+    "height": 180,
+    "sport": "He занимаюсь",
+    "alcohol": "He пью",
+    "smoking": "Курю",
+    "birthday": date(2000, 1, 1),
+}
+
 hobbies_dict = {
     "hobbies": [
         {"hobby_name": "qwe"},
@@ -133,6 +150,24 @@ async def authorised_cookie_user3(user3: AuthUser, async_client: TestClient) ->
     return {"mir": jwt}
 
 
+async def create_user_with_questionnaire(
+    session: AsyncSession,
+    gender: str,
+    **data: object,
+) -> tuple[AuthUser, UserQuestionnaire]:
+    user = AuthUser(email=f"{uuid.uuid4().hex}@feed.com", hashed_password=b"pass")
+    session.add(user)
+    await session.flush()
+    questionnaire = UserQuestionnaire(
+        **{**feed_questionnaire_data, **data},
+        gender=gender,
+        user_id=user.id,
+    )
+    session.add(questionnaire)
+    await session.commit()
+    return user, questionnaire
+
+
 @pytest.fixture(scope="module")
 async def questionary(get_async_session: AsyncSession, user2: AuthUser) -> UserQuestionnaire:
     """User questionary."""
@@ -140,9 +175,7 @@ async def questionary(get_async_session: AsyncSession, user2: AuthUser) -> UserQ
     async with get_async_session as db:
         questionnaire = UserQuestionnaire(**user_questionary_data)
         _hobbies: list = hobbies_dict["hobbies"]
-        for hobby in _hobbies:
-            hobby_obj = UserQuestionnaireHobby(hobby_name=hobby["hobby_name"])
-            questionnaire.hobbies.append(hobby_obj)
+        await set_hobbies(questionnaire, [hobby["hobby_name"] for hobby in _hobbies], db)
         db.add(questionnaire)
         await db.commit()
     return questionnaire
@@ -155,9 +188,7 @@ async def questionary_user3(get_async_session: AsyncSession, user3: AuthUser) ->
     async with get_async_session as db:
         questionary_user3 = UserQuestionnaire(**user3_questionary_data)
         _hobbies: list = hobbies_dict["hobbies"]
-        for hobby in _hobbies:
-            hobby_obj = UserQuestionnaireHobby(hobby_name=hobby["hobby_name"])
-            questionary_user3.hobbies.append(hobby_obj)
+        await set_hobbies(questionary_user3, [hobby["hobby_name"] for hobby in _hobbies], db)
         db.add(questionary_user3)
         await db.commit()
     return questionary_user3
@@ -247,6 +247,7 @@ class TestUserProfile:
             "search_range_max": profile.search_range_max,
             "search_age_min": profile.search_age_min,
             "search_age_max": profile.search_age_max,
+            "timezone": profile.timezone,
         }
 
     async def test_get_user_profile_without_token(
@@ -299,6 +300,7 @@ class TestUserProfile:
             "search_range_max": data.get("search_range_max"),
             "search_age_min": data.get("search_age_min"),
             "search_age_max": data.get("search_age_max"),
+            "timezone": "UTC",
         }
 
     async def test_update_user_profile_without_token(
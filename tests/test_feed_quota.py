@@ -0,0 +1,47 @@
+import time
+import uuid
+
+from src.questionnaire import quota
+from src.redis.redis import redis as redis_client
+
+
+async def test_feed_lists_run_out():
+    user_id = uuid.uuid4()
+    for _ in range(quota.FEED_LISTS_PER_DAY):
+        assert await quota.take_feed_list(user_id, None, is_prem=False)
+
+    assert not await quota.take_feed_list(user_id, None, is_prem=False)
+    assert await quota.used_feed_lists(user_id, None) == quota.FEED_LISTS_PER_DAY
+
+
+async def test_premium_feed_lists():
+    user_id = uuid.uuid4()
+    taken = [
+        await quota.take_feed_list(user_id, None, is_prem=True)
+        for _ in range(quota.PREMIUM_FEED_LISTS_PER_DAY + 1)
+    ]
+    assert taken.count(True) == quota.PREMIUM_FEED_LISTS_PER_DAY
+
+
+async def test_feed_list_given_back():
+    user_id = uuid.uuid4()
+    assert await quota.take_feed_list(user_id, None, is_prem=False)
+    await quota.give_back_feed_list(user_id, None)
+    assert await quota.used_feed_lists(user_id, None) == 0
+
+    # nothing to give back to once the day is over
+    await quota.give_back_feed_list(uuid.uuid4(), None)
+
+
+async def test_feed_lists_expire_at_local_midnight():
+    user_id = uuid.uuid4()
+    for timezone in ("Pacific/Kiritimati", "Pacific/Pago_Pago"):
+        assert await quota.take_feed_list(user_id, timezone, is_prem=False)
+        day, midnight = quota._today(timezone)
+        ttl = await redis_client.redis_client.ttl(quota._quota_key(user_id, day))
+        assert 0 < ttl <= 24 * 60 * 60
+        assert abs(time.time() + ttl - midnight) <= 2
+
+
+async def test_unknown_timezone_falls_back_to_utc():
+    assert quota._today("Mars/Olympus_Mons") == quota._today(quota.DEFAULT_TIMEZONE)
@@ -0,0 +1,94 @@
+from datetime import date
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.questionnaire import ranking
+from src.questionnaire.params_choice import AlcoholType, Goal, SmokingType, SportType
+
+
+def questionnaire(**data: object) -> SimpleNamespace:
+    return SimpleNamespace(**{
+        "goals": Goal.friendship,
+        "sport": SportType.sometimes,
+        "smoking": SmokingType.negative,
+        "alcohol": AlcoholType.sometimes,
+        "height": 175,
+        "birthday": date(2000, 1, 1),
+        "hobby_ids": [],
+        **data,
+    })
+
+
+def test_most_compatible_first():
+    viewer = questionnaire()
+    candidates = [
+        questionnaire(goals=Goal.flirts, smoking=SmokingType.positive),
+        questionnaire(),
+        questionnaire(sport=SportType.hate),
+    ]
+    assert ranking.rank(viewer, candidates) == [1, 2, 0]
+
+
+def test_choices_as_stored_values():
+    viewer = questionnaire(goals=Goal.friendship.value)
+    candidates = [questionnaire(goals=Goal.flirts.value), questionnaire(goals=Goal.friendship.value)]
+    assert ranking.rank(viewer, candidates) == [1, 0]
+
+
+def test_hobby_overlap():
+    viewer = questionnaire(hobby_ids=[1, 2])
+    candidates = [
+        questionnaire(hobby_ids=[3]),
+        questionnaire(hobby_ids=[2, 1]),
+        questionnaire(hobby_ids=[1, 2, 70]),
+    ]
+    assert ranking.rank(viewer, candidates) == [1, 2, 0]
+
+
+def test_age_and_height_distance():
+    viewer = questionnaire()
+    candidates = [
+        questionnaire(birthday=date(1990, 1, 1)),
+        questionnaire(height=None),
+        questionnaire(birthday=date(2001, 1, 1), height=170),
+    ]
+    assert ranking.rank(viewer, candidates) == [2, 1, 0]
+
+
+def test_missing_values_score_nothing():
+    viewer = questionnaire(goals=None, height=None)
+    candidates = [questionnaire(goals=None, height=None)]
+    features = ranking.encode(candidates, 0)
+    assert features.choices[0, 0] == ranking.MISSING
+
+    weights = ranking.ranking_weights({"sport": 0, "smoking": 0, "alcohol": 0, "age": 0, "hobbies": 0})
+    scores = ranking.score(ranking.encode([viewer], 0), features, weights)
+    assert scores.tolist() == [0]
+
+
+def test_equal_scores_keep_order():
+    viewer = questionnaire()
+    assert ranking.rank(viewer, [questionnaire()] * 4) == [0, 1, 2, 3]
+    assert ranking.rank(viewer, []) == []
+
+
+def test_weights():
+    weights = ranking.ranking_weights({"goals": 10})
+    assert weights.sum() == pytest.approx(1)
+    assert weights[ranking.FEATURES.index("goals")] == weights.max()
+
+    viewer = questionnaire()
+    candidates = [questionnaire(goals=Goal.flirts), questionnaire(sport=SportType.hate)]
+    only_goals = ranking.ranking_weights(
+        {name: 0 for name in ranking.FEATURES if name != "goals"},
+    )
+    assert ranking.rank(viewer, candidates, only_goals) == [1, 0]
+    assert np.array_equal(ranking.ranking_weights({}), ranking.ranking_weights(ranking.DEFAULT_WEIGHTS))
+
+
+@pytest.mark.parametrize("weights", [{"eyes": 1}, {"goals": -1}, dict.fromkeys(ranking.FEATURES, 0)])
+def test_bad_weights(weights: dict[str, float]):
+    with pytest.raises(ValueError):  # noqa: PT011
+        ranking.ranking_weights(weights)
@@ -83,10 +83,10 @@ class TestMatch:
             "birthday": "2004-02-14",
             "hobbies": [
                 {
-                    "hobby_name": questionary.hobbies[0].hobby_name,
+                    "hobby_name": questionary.hobby_names[0],
                 },
                 {
-                    "hobby_name": questionary.hobbies[1].hobby_name,
+                    "hobby_name": questionary.hobby_names[1],
                 },
             ],
             "height": questionary.height,
@@ -0,0 +1,72 @@
+import pytest
+from async_asgi_testclient import TestClient
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.models import AuthUser
+from src.exceptions import BlockedUserException
+from src.likes import crud as likes_crud
+from src.likes.schemas import UserLikeRequest
+from src.questionnaire import blacklist, crud
+from src.questionnaire.models import BlackListUser
+from tests.fixtures import create_user_with_questionnaire
+
+
+async def block(session: AsyncSession, blocked_by: AuthUser, blocked: AuthUser) -> None:
+    session.add(BlackListUser(blocked_by_id=blocked_by.id, blocked_id=blocked.id))
+    await session.commit()
+    await blacklist.drop_blocked(blocked_by.id, blocked.id)
+
+
+async def test_blocked_users_left_out_of_feed(get_async_session: AsyncSession):
+    viewer, _ = await create_user_with_questionnaire(get_async_session, "Male", city="block_city")
+    blocked_user, _ = await create_user_with_questionnaire(get_async_session, "Female", city="block_city")
+    blocking_user, _ = await create_user_with_questionnaire(get_async_session, "Female", city="block_city")
+    _, other = await create_user_with_questionnaire(get_async_session, "Female", city="block_city")
+    await block(get_async_session, viewer, blocked_user)
+    await block(get_async_session, blocking_user, viewer)
+
+    page = await crud.get_list_questionnaire_by_cursor(viewer, get_async_session, None)
+    assert [questionnaire.id for questionnaire in page.items] == [other.id]
+
+
+async def test_block_set_cached_until_dropped(get_async_session: AsyncSession):
+    user, _ = await create_user_with_questionnaire(get_async_session, "Male")
+    other, _ = await create_user_with_questionnaire(get_async_session, "Female")
+    assert await blacklist.get_blocked_ids(user.id, get_async_session) == set()
+
+    get_async_session.add(BlackListUser(blocked_by_id=other.id, blocked_id=user.id))
+    await get_async_session.commit()
+    # served from the cache until the block is reported
+    assert not await blacklist.is_blocked(user.id, other.id, get_async_session)
+
+    await blacklist.drop_blocked(user.id, other.id)
+    assert await blacklist.is_blocked(user.id, other.id, get_async_session)
+    assert await blacklist.get_blocked_ids(user.id, get_async_session) == {other.id}
+
+
+async def test_like_blocked_user(get_async_session: AsyncSession):
+    user, _ = await create_user_with_questionnaire(get_async_session, "Male")
+    other, _ = await create_user_with_questionnaire(get_async_session, "Female")
+    await block(get_async_session, other, user)
+
+    with pytest.raises(BlockedUserException):
+        await likes_crud.add_like(user, UserLikeRequest(liked_user_id=other.id), get_async_session)
+
+
+async def test_like_blocked_user_api(
+    async_client: TestClient,
+    get_async_session: AsyncSession,
+    user: AuthUser,
+    user2: AuthUser,
+    authorised_cookie: dict,
+):
+    await block(get_async_session, user2, user)
+
+    response = await async_client.post(
+        "/api/v1/likes",
+        json={"liked_user_id": str(user2.id), "is_liked": True},
+        cookies=authorised_cookie,
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.json()["detail"] == "User is blocked"
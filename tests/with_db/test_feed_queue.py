@@ -0,0 +1,234 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.models import AuthUser, UserSettings
+from src.likes import crud as likes_crud
+from src.likes.schemas import UserLikeRequest
+from src.questionnaire import crud, geo, quota
+from src.questionnaire import redis as candidates
+from src.questionnaire.models import UserQuestionnaire
+from src.questionnaire.schemas import CreateUserQuestionnaireSchema, QuestionnaireLocationSchema
+from src.redis.redis import redis as redis_client
+from tests.fixtures import create_user_with_questionnaire, feed_questionnaire_data
+
+
+async def reset_feed_lists(user: AuthUser) -> None:
+    """Start a new day of the user's feed quota."""
+    day, _ = quota._today(quota.DEFAULT_TIMEZONE)
+    await redis_client.delete(quota._quota_key(user.id, day))
+
+
+@pytest.fixture(scope="module")
+async def viewer(get_async_session: AsyncSession) -> AuthUser:
+    user, _ = await create_user_with_questionnaire(get_async_session, "Male")
+    return user
+
+
+@pytest.fixture(scope="module")
+async def pool(get_async_session: AsyncSession, viewer: AuthUser) -> list[UserQuestionnaire]:
+    """Seven eligible candidates: one full page and a short one."""
+    return [
+        (await create_user_with_questionnaire(get_async_session, "Female"))[1]
+        for _ in range(crud.FEED_PAGE_SIZE + 2)
+    ]
+
+
+async def test_feed_pages_do_not_repeat(
+    get_async_session: AsyncSession,
+    viewer: AuthUser,
+    pool: list[UserQuestionnaire],
+):
+    first = await crud.get_feed_questionnaire(viewer, get_async_session)
+    assert len(first) == crud.FEED_PAGE_SIZE
+
+    # the router tops the queue up after every page
+    await crud.refill_candidate_queue(viewer.id)
+    assert await candidates.count_candidates(viewer.id) == 2
+
+    second = await crud.get_feed_questionnaire(viewer, get_async_session)
+    await crud.refill_candidate_queue(viewer.id)
+    assert len(second) == 2
+
+    shown = [questionnaire.id for questionnaire in first + second]
+    assert sorted(shown) == sorted(questionnaire.id for questionnaire in pool)
+
+    assert await quota.used_feed_lists(viewer.id, None) == 2
+    assert await crud.get_feed_questionnaire(viewer, get_async_session) == []
+    assert await quota.used_feed_lists(viewer.id, None) == 2
+
+
+async def test_feed_refill_picks_up_new_profiles(
+    get_async_session: AsyncSession,
+    viewer: AuthUser,
+    pool: list[UserQuestionnaire],
+):
+    await reset_feed_lists(viewer)
+    _, newcomer = await create_user_with_questionnaire(get_async_session, "Female")
+
+    await crud.refill_candidate_queue(viewer.id)
+    assert await candidates.count_candidates(viewer.id) == 1
+
+    feed = await crud.get_feed_questionnaire(viewer, get_async_session)
+    assert [questionnaire.id for questionnaire in feed] == [newcomer.id]
+
+
+async def test_feed_refill_respects_lock(
+    get_async_session: AsyncSession,
+    viewer: AuthUser,
+    pool: list[UserQuestionnaire],
+):
+    await reset_feed_lists(viewer)
+    await create_user_with_questionnaire(get_async_session, "Female")
+
+    assert await candidates.lock_candidates_refill(viewer.id)
+    try:
+        await crud.refill_candidate_queue(viewer.id)
+        assert await candidates.count_candidates(viewer.id) == 0
+
+        assert await crud.get_feed_questionnaire(viewer, get_async_session) == []
+        assert await quota.used_feed_lists(viewer.id, None) == 0
+    finally:
+        await candidates.unlock_candidates_refill(viewer.id)
+
+    assert len(await crud.get_feed_questionnaire(viewer, get_async_session)) == 1
+
+
+async def test_feed_skips_liked_profiles(
+    get_async_session: AsyncSession,
+    viewer: AuthUser,
+    pool: list[UserQuestionnaire],
+):
+    await reset_feed_lists(viewer)
+    liked_user, liked = await create_user_with_questionnaire(get_async_session, "Female")
+    _, other = await create_user_with_questionnaire(get_async_session, "Female")
+    await crud.refill_candidate_queue(viewer.id)
+
+    await likes_crud.add_like(viewer, UserLikeRequest(liked_user_id=liked_user.id, is_liked=True), get_async_session)
+
+    feed = await crud.get_feed_questionnaire(viewer, get_async_session)
+    assert [questionnaire.id for questionnaire in feed] == [other.id]
+    assert liked.id not in [questionnaire.id for questionnaire in feed]
+
+
+async def test_feed_queue_dropped_on_update(
+    get_async_session: AsyncSession,
+    viewer: AuthUser,
+    pool: list[UserQuestionnaire],
+):
+    await create_user_with_questionnaire(get_async_session, "Female")
+    await crud.refill_candidate_queue(viewer.id)
+    assert await candidates.count_candidates(viewer.id) == 1
+
+    questionnaire = await crud.get_questionnaire(viewer.id, get_async_session)
+    await crud.update_questionnaire(
+        questionnaire.id,
+        CreateUserQuestionnaireSchema(**feed_questionnaire_data, gender="Male", hobbies=[]),
+        get_async_session,
+        viewer,
+    )
+    assert await candidates.count_candidates(viewer.id) == 0
+    assert await candidates.get_candidates_cursor(viewer.id) is None
+
+
+async def test_feed_queue_dropped_on_delete(
+    get_async_session: AsyncSession,
+    viewer: AuthUser,
+    pool: list[UserQuestionnaire],
+):
+    await crud.refill_candidate_queue(viewer.id)
+    assert await candidates.count_candidates(viewer.id) > 0
+
+    questionnaire = await crud.get_questionnaire(viewer.id, get_async_session)
+    await crud.delete_quest(viewer, questionnaire.id, get_async_session)
+    assert await candidates.count_candidates(viewer.id) == 0
+
+
+async def test_list_by_cursor_pages_through_feed(get_async_session: AsyncSession):
+    reader, _ = await create_user_with_questionnaire(get_async_session, "Male", city="cursor_city")
+    seeded = [
+        (await create_user_with_questionnaire(get_async_session, "Female", city="cursor_city"))[1]
+        for _ in range(crud.FEED_PAGE_SIZE + 1)
+    ]
+
+    first = await crud.get_list_questionnaire_by_cursor(reader, get_async_session, None)
+    assert len(first.items) == crud.FEED_PAGE_SIZE
+    assert first.next_cursor is not None
+
+    last = await crud.get_list_questionnaire_by_cursor(reader, get_async_session, first.next_cursor)
+    assert len(last.items) == 1
+    assert last.next_cursor is None
+
+    shown = [questionnaire.id for questionnaire in first.items + last.items]
+    assert shown == [questionnaire.id for questionnaire in seeded]
+
+
+async def create_user_at(session: AsyncSession, gender: str, latitude: float, longitude: float) -> UserQuestionnaire:
+    _, questionnaire = await create_user_with_questionnaire(
+        session,
+        gender,
+        city="geo_city",
+        latitude=latitude,
+        longitude=longitude,
+        geohash=geo.encode_geohash(latitude, longitude),
+    )
+    return questionnaire
+
+
+async def test_feed_by_distance_honours_search_range(get_async_session: AsyncSession):
+    searcher, _ = await create_user_with_questionnaire(get_async_session, "Male", city="elsewhere")
+    search_settings = UserSettings(user_id=searcher.id, search_range_min=0, search_range_max=10)
+    get_async_session.add(search_settings)
+    await get_async_session.commit()
+    # about 3 and 60 km north of the searcher
+    near = await create_user_at(get_async_session, "Female", 55.7838, 37.6173)
+    far = await create_user_at(get_async_session, "Female", 56.2950, 37.6173)
+    await create_user_with_questionnaire(get_async_session, "Female", city="elsewhere")
+
+    await crud.update_location(
+        QuestionnaireLocationSchema(latitude=55.7558, longitude=37.6173),
+        get_async_session,
+        searcher,
+    )
+    page = await crud.get_list_questionnaire_by_cursor(searcher, get_async_session, None)
+    assert [questionnaire.id for questionnaire in page.items] == [near.id]
+
+    search_settings.search_range_min, search_settings.search_range_max = 20, 100
+    await get_async_session.commit()
+    page = await crud.get_list_questionnaire_by_cursor(searcher, get_async_session, None)
+    assert [questionnaire.id for questionnaire in page.items] == [far.id]
+
+
+async def test_feed_by_age_window(get_async_session: AsyncSession):
+    searcher, _ = await create_user_with_questionnaire(get_async_session, "Male", city="age_city")
+    get_async_session.add(UserSettings(user_id=searcher.id, search_age_min=20, search_age_max=25))
+    await get_async_session.commit()
+    today = date.today()
+    born = {
+        age: (await create_user_with_questionnaire(
+            get_async_session,
+            "Female",
+            city="age_city",
+            birthday=crud._years_before(today, age) - timedelta(days=1),
+        ))[1]
+        for age in (19, 20, 25, 26)
+    }
+
+    page = await crud.get_list_questionnaire_by_cursor(searcher, get_async_session, None)
+    assert [questionnaire.id for questionnaire in page.items] == [born[20].id, born[25].id]
+
+
+async def test_feed_queue_ranked_by_compatibility(get_async_session: AsyncSession):
+    searcher, _ = await create_user_with_questionnaire(get_async_session, "Male", city="rank_city")
+    incompatible = (await create_user_with_questionnaire(
+        get_async_session,
+        "Female",
+        city="rank_city",
+        goals="Флирт",
+        smoking="Негативно",
+    ))[1]
+    compatible = (await create_user_with_questionnaire(get_async_session, "Female", city="rank_city"))[1]
+
+    feed = await crud.get_feed_questionnaire(searcher, get_async_session)
+    assert [questionnaire.id for questionnaire in feed] == [compatible.id, incompatible.id]
@@ -1,3 +1,6 @@
+import base64
+from datetime import datetime, timezone
+
 from async_asgi_testclient import TestClient
 from dirty_equals import IsUUID
 from fastapi import status
@@ -5,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.models import AuthUser
 from src.likes.models import UserLike
+from src.pagination import encode_cursor
 from src.questionnaire.crud import get_questionnaire
 from src.questionnaire.models import UserQuestionnaire
 
@@ -142,6 +146,58 @@ async def test_logic_for_reusing_questionnaires(
     assert response.json() == []
 
 
+async def test_list_questionnaire_by_cursor(
+    async_client: TestClient,
+    user3: AuthUser,
+    authorised_cookie_user3: dict,
+    questionary: UserQuestionnaire,
+    questionary_user3: UserQuestionnaire,
+):
+    bad_cursors = [
+        "not-a-cursor",
+        encode_cursor(datetime.now(tz=timezone.utc), questionary.id),
+        base64.urlsafe_b64encode(b'[1, {"a": 2}]').decode(),
+    ]
+    for cursor in bad_cursors:
+        response = await async_client.get(
+            "/api/v1/questionnaire/list",
+            query_string={"cursor": cursor},
+            cookies=authorised_cookie_user3,
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = await async_client.get(
+        "/api/v1/questionnaire/list",
+        cookies=authorised_cookie_user3,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["next_cursor"] is None
+    assert [item["id"] for item in response.json()["items"]] == [str(questionary.id)]
+
+
+async def test_feed_questionnaire(
+    async_client: TestClient,
+    user3: AuthUser,
+    authorised_cookie_user3: dict,
+    questionary: UserQuestionnaire,
+    questionary_user3: UserQuestionnaire,
+):
+    response = await async_client.get(
+        "/api/v1/questionnaire/feed",
+        cookies=authorised_cookie_user3,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.json()] == [str(questionary.id)]
+
+    # the only candidate was already shown, so it must not be queued again
+    response = await async_client.get(
+        "/api/v1/questionnaire/feed",
+        cookies=authorised_cookie_user3,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+
 async def test_update_quest(
     async_client: TestClient,
     questionary: UserQuestionnaire,
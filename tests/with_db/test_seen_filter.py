@@ -0,0 +1,59 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.likes import crud as likes_crud
+from src.likes import redis as seen
+from src.likes.models import UserLike
+from src.likes.schemas import UserLikeRequest
+from src.questionnaire import crud
+from tests.fixtures import create_user_with_questionnaire
+
+
+async def test_seen_filter_built_from_likes(get_async_session: AsyncSession):
+    user, _ = await create_user_with_questionnaire(get_async_session, "Male")
+    liked, _ = await create_user_with_questionnaire(get_async_session, "Female")
+    disliked, _ = await create_user_with_questionnaire(get_async_session, "Female")
+    other, _ = await create_user_with_questionnaire(get_async_session, "Female")
+    get_async_session.add_all([
+        UserLike(user_id=user.id, liked_user_id=liked.id, is_liked=True),
+        UserLike(user_id=user.id, liked_user_id=disliked.id, is_liked=False),
+    ])
+    await get_async_session.commit()
+
+    quest_user_ids = [liked.id, disliked.id, other.id]
+    assert await seen.filter_unseen(user.id, quest_user_ids, get_async_session) == [False, False, True]
+    # answered by the filter now that it is built
+    assert await seen.filter_unseen(user.id, quest_user_ids, get_async_session) == [False, False, True]
+
+    await likes_crud.add_like(user, UserLikeRequest(liked_user_id=other.id), get_async_session)
+    assert await seen.filter_unseen(user.id, quest_user_ids, get_async_session) == [False, False, False]
+
+
+async def test_mark_seen_waits_for_the_filter_to_be_built(get_async_session: AsyncSession):
+    user, _ = await create_user_with_questionnaire(get_async_session, "Male")
+    liked, _ = await create_user_with_questionnaire(get_async_session, "Female")
+    other, _ = await create_user_with_questionnaire(get_async_session, "Female")
+    get_async_session.add(UserLike(user_id=user.id, liked_user_id=liked.id, is_liked=True))
+    await get_async_session.commit()
+
+    # a filter made of this like alone would let the older ones through
+    await seen.mark_seen(user.id, other.id)
+    assert await seen.filter_unseen(user.id, [liked.id, other.id], get_async_session) == [False, True]
+
+
+async def test_feed_skips_a_batch_of_seen_profiles(get_async_session: AsyncSession):
+    viewer, _ = await create_user_with_questionnaire(get_async_session, "Male", city="seen_city")
+    batch_size = crud.FEED_PAGE_SIZE * crud.SEEN_OVERSAMPLE
+    pool = [
+        (await create_user_with_questionnaire(get_async_session, "Female", city="seen_city"))[1]
+        for _ in range(batch_size + 1)
+    ]
+    for questionnaire in pool[:batch_size]:
+        await likes_crud.add_like(viewer, UserLikeRequest(liked_user_id=questionnaire.user_id), get_async_session)
+
+    page = await crud.get_list_questionnaire_by_cursor(viewer, get_async_session, None)
+    assert page.items == []
+    assert page.next_cursor is not None
+
+    page = await crud.get_list_questionnaire_by_cursor(viewer, get_async_session, page.next_cursor)
+    assert [questionnaire.id for questionnaire in page.items] == [pool[-1].id]
+    assert page.next_cursor is None